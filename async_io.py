@@ -0,0 +1,59 @@
+import asyncio
+import os
+import threading
+import time
+
+
+class IOBatch:
+    def __init__(self, items):
+        self.items = list(items)
+        self.total = len(self.items)
+        self.done = 0
+        self.results = [None] * self.total
+        self.errors = []
+        self.future = None
+        self.started = time.perf_counter()
+
+    def finished(self):
+        return self.future is not None and self.future.done()
+
+    def succeeded(self):
+        # Pares (item, resultado) na ordem original, sem os que falharam
+        failed = {item for item, _ in self.errors}
+        return [(item, result) for item, result in zip(self.items, self.results) if item not in failed]
+
+
+class BackgroundIO:
+    # Um loop asyncio numa thread própria; o Tk só consulta o progresso do lote
+    def __init__(self, concurrency=8):
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def map(self, function, items):
+        batch = IOBatch(items)
+        batch.future = asyncio.run_coroutine_threadsafe(self._run(function, batch), self.loop)
+        return batch
+
+    async def _run(self, function, batch):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(index, item):
+            async with semaphore:
+                try:
+                    batch.results[index] = await asyncio.to_thread(function, item)
+                except Exception as e:
+                    # Os erros são acumulados para um único relatório no fim do lote
+                    batch.errors.append((item, str(e)))
+                batch.done += 1
+
+        await asyncio.gather(*(run_one(index, item) for index, item in enumerate(batch.items)))
+        return batch
+
+
+def format_error_report(errors, limit=20):
+    lines = [f"{os.path.basename(str(item))}: {error}" for item, error in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... e mais {len(errors) - limit} erro(s)")
+    return "\n".join(lines)
@@ -1,41 +1,104 @@
 import sys
+import os
+import math
 import re
+from collections import Counter
+from itertools import islice
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QTextEdit, QPushButton, QFrame, QSlider, QColorDialog,
                              QStatusBar, QGroupBox, QSplitter, QFileDialog, QMessageBox,
-                             QToolBar, QAction, QMenu, QSpinBox, QFontDialog, QProgressBar, QDialog)
-from PyQt5.QtCore import Qt, QSettings
-from PyQt5.QtGui import QFont, QColor, QPalette
+                             QToolBar, QAction, QMenu, QSpinBox, QFontDialog, QProgressBar, QDialog,
+                             QListView, QAbstractItemView, QComboBox)
+from PyQt5.QtCore import Qt, QSettings, QAbstractListModel, QModelIndex, QTimer
+from PyQt5.QtGui import QFont, QColor, QPalette, QTextCursor
+
+from texto_divisor import (dividir_em_trechos, dividir_texto, dividir_equilibrado, estatisticas_trechos,
+                           cortes_gulosos, aparar, ler_blocos, detectar_encoding_arquivo)
+from substituicao_verbos import SubstituidorVerbos, ARQUIVO_REGRAS
+
+TAMANHO_PREVIA = 120
+TRECHOS_POR_LOTE = 2000
+ATRASO_ESTATISTICAS_MS = 300
+BLOCO_CARREGAMENTO = 1 << 18
+# Caracteres relidos em volta de cada edição; maior que qualquer palavra da tabela de regras
+MARGEM_SUBSTITUICAO = 64
+MODOS_DIVISAO = {"guloso": "Guloso (original)", "equilibrado": "Equilibrado"}
+
+
+class ModeloTrechos(QAbstractListModel):
+    """Trechos exibidos por QListView; só as linhas visíveis são desenhadas."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trechos = []
+        self.copiados = set()
+        self.total_caracteres = 0
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.trechos)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        linha = index.row()
+        trecho = self.trechos[linha]
+        if role == Qt.DisplayRole:
+            marca = "✓ " if linha in self.copiados else ""
+            previa = trecho[:TAMANHO_PREVIA].replace("\n", " ")
+            return f"{marca}Trecho {linha + 1} ({len(trecho)} caracteres): {previa}..."
+        if role == Qt.ToolTipRole:
+            return trecho[:1000]
+        return None
+    
+    def limpar(self):
+        self.beginResetModel()
+        self.trechos = []
+        self.copiados = set()
+        self.total_caracteres = 0
+        self.endResetModel()
+    
+    def adicionar(self, trechos):
+        if not trechos:
+            return
+        
+        inicio = len(self.trechos)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(trechos) - 1)
+        self.trechos.extend(trechos)
+        self.total_caracteres += sum(len(trecho) for trecho in trechos)
+        self.endInsertRows()
+    
+    def marcar_copiados(self, linhas):
+        self.copiados.update(linhas)
+        if linhas:
+            self.dataChanged.emit(self.index(min(linhas)), self.index(max(linhas)))
+    
+    def partes_resultado(self):
+        """Mesmo texto que a antiga área de saída mostrava, gerado parte a parte."""
+        for i, trecho in enumerate(self.trechos, 1):
+            yield f"Trecho {i} ({len(trecho)} caracteres):\n{trecho}\n\n"
+        yield f"Total de caracteres: {self.total_caracteres}"
+
 
 class CopiarTrechosDialog(QDialog):
     """Janela pop-up para copiar todos os trechos."""
-    def __init__(self, trechos, parent=None):
+    def __init__(self, modelo, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Copiar Trechos")
         self.setMinimumSize(600, 400)
-        self.trechos = trechos
-        self.trechos_copiados = set()
+        self.modelo = modelo
         
         layout = QVBoxLayout(self)
         
-        # Adicionar cada trecho com um botão de cópia
-        self.labels_visto = []
-        for i, trecho in enumerate(trechos, 1):
-            hbox = QHBoxLayout()
-            
-            label = QLabel(f"Trecho {i} ({len(trecho)} caracteres):")
-            hbox.addWidget(label)
-            
-            copiar_btn = QPushButton("Copiar")
-            copiar_btn.clicked.connect(lambda _, idx=i: self.copiar_trecho(idx))
-            hbox.addWidget(copiar_btn)
-            
-            visto_label = QLabel()
-            visto_label.setVisible(False)
-            hbox.addWidget(visto_label)
-            self.labels_visto.append(visto_label)
-            
-            layout.addLayout(hbox)
+        self.lista = QListView(self)
+        self.lista.setModel(modelo)
+        self.lista.setUniformItemSizes(True)
+        self.lista.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.lista.doubleClicked.connect(lambda index: self.copiar_trecho(index.row() + 1))
+        layout.addWidget(self.lista)
+        
+        copiar_btn = QPushButton("Copiar Selecionado", self)
+        copiar_btn.clicked.connect(self.copiar_selecionados)
+        layout.addWidget(copiar_btn)
         
         copiar_todos_btn = QPushButton("Copiar Todos", self)
         copiar_todos_btn.clicked.connect(self.copiar_todos_trechos)
@@ -47,24 +110,26 @@ class CopiarTrechosDialog(QDialog):
     
     def copiar_trecho(self, idx):
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.trechos[idx-1])
+        clipboard.setText(self.modelo.trechos[idx-1])
         self.parent().status_bar.showMessage(f"Trecho {idx} copiado para a área de transferência.")
-        
-        self.labels_visto[idx-1].setText("✓")
-        self.labels_visto[idx-1].setVisible(True)
-        self.trechos_copiados.add(idx)
+        self.modelo.marcar_copiados({idx - 1})
+    
+    def copiar_selecionados(self):
+        linhas = sorted(index.row() for index in self.lista.selectionModel().selectedIndexes())
+        if len(linhas) == 1:
+            self.copiar_trecho(linhas[0] + 1)
+        elif linhas:
+            texto = "\n\n".join(f"Trecho {linha + 1}:\n{self.modelo.trechos[linha]}" for linha in linhas)
+            QApplication.clipboard().setText(texto)
+            self.parent().status_bar.showMessage(f"{len(linhas)} trechos copiados para a área de transferência.")
+            self.modelo.marcar_copiados(set(linhas))
     
     def copiar_todos_trechos(self):
-        texto_completo = "\n\n".join([f"Trecho {i+1}:\n{trecho}" for i, trecho in enumerate(self.trechos)])
+        texto_completo = "\n\n".join([f"Trecho {i+1}:\n{trecho}" for i, trecho in enumerate(self.modelo.trechos)])
         clipboard = QApplication.clipboard()
         clipboard.setText(texto_completo)
         self.parent().status_bar.showMessage("Todos os trechos copiados para a área de transferência.")
-        
-        for visto_label in self.labels_visto:
-            visto_label.setText("✓")
-            visto_label.setVisible(True)
-        
-        self.trechos_copiados = set(range(1, len(self.trechos)+1))
+        self.modelo.marcar_copiados(set(range(len(self.modelo.trechos))))
 
     def closeEvent(self, event):
         """Quando o pop-up é fechado, mostra a janela principal novamente"""
@@ -81,6 +146,9 @@ class DivisorTexto(QMainWindow):
         self.settings = QSettings("DivisorTexto", "Configurações")
         self.limite_min = self.settings.value("limite_min", 1300, type=int)
         self.limite_max = self.settings.value("limite_max", 1500, type=int)
+        self.modo_divisao = self.settings.value("modo_divisao", "guloso", type=str)
+        if self.modo_divisao not in MODOS_DIVISAO:
+            self.modo_divisao = "guloso"
         
         self.tema_escuro = self.settings.value("tema_escuro", "escuro", type=str).lower()
         if self.tema_escuro not in ["escuro", "claro", "alto_contraste"]:
@@ -109,7 +177,34 @@ class DivisorTexto(QMainWindow):
             }
         }
         
+        self.modelo_trechos = ModeloTrechos(self)
+        self.gerador_trechos = None
+        self.tamanho_entrada = 0
+        self.timer_divisao = QTimer(self)
+        self.timer_divisao.timeout.connect(self.continuar_divisao)
+        
+        # Palavras e trechos previstos só são recontados quando o usuário para de digitar
+        self.palavras = 0
+        self.trechos_previstos = 0
+        self.cortes_previstos = None
+        self.alteracao_inicio = None
+        self.alteracao_fim = None
+        self.timer_estatisticas = QTimer(self)
+        self.timer_estatisticas.setSingleShot(True)
+        self.timer_estatisticas.setInterval(ATRASO_ESTATISTICAS_MS)
+        self.timer_estatisticas.timeout.connect(self.atualizar_estatisticas)
+        
+        self.gerador_carregamento = None
+        self.arquivo_carregando = None
+        self.tamanho_carregando = 0
+        self.timer_carregamento = QTimer(self)
+        self.timer_carregamento.timeout.connect(self.continuar_carregamento)
+        
+        self.arquivo_regras = self.settings.value("arquivo_regras", ARQUIVO_REGRAS, type=str)
+        self.substituidor = SubstituidorVerbos({})
+        
         self.setup_ui()
+        self.carregar_regras()
         self.aplicar_tema(self.tema_escuro)
         
     def setup_ui(self):
@@ -135,11 +230,10 @@ class DivisorTexto(QMainWindow):
         self.entrada_texto = QTextEdit()
         self.entrada_texto.setFont(self.fonte_entrada)
         self.entrada_texto.setPlaceholderText("Cole aqui o texto que deseja dividir...")
-        self.entrada_texto.textChanged.connect(self.substituir_verbos_automaticamente)
-        self.entrada_texto.textChanged.connect(self.atualizar_contagem_caracteres)
+        self.entrada_texto.document().contentsChange.connect(self.registrar_alteracao)
         self.layout_entrada.addWidget(self.entrada_texto)
         
-        self.label_caracteres_entrada = QLabel("Caracteres: 0")
+        self.label_caracteres_entrada = QLabel("Caracteres: 0 | Palavras: 0 | Trechos previstos: 0")
         self.layout_entrada.addWidget(self.label_caracteres_entrada)
         self.splitter.addWidget(self.grupo_entrada)
         
@@ -147,10 +241,11 @@ class DivisorTexto(QMainWindow):
         self.grupo_saida.setFont(QFont("Segoe UI", 10))
         self.layout_saida = QVBoxLayout(self.grupo_saida)
         
-        self.saida_texto = QTextEdit()
-        self.saida_texto.setFont(self.fonte_saida)
-        self.saida_texto.setReadOnly(True)
-        self.layout_saida.addWidget(self.saida_texto)
+        self.saida_trechos = QListView()
+        self.saida_trechos.setFont(self.fonte_saida)
+        self.saida_trechos.setModel(self.modelo_trechos)
+        self.saida_trechos.setUniformItemSizes(True)
+        self.layout_saida.addWidget(self.saida_trechos)
         self.splitter.addWidget(self.grupo_saida)
         
         self.splitter.setSizes([300, 600])
@@ -180,6 +275,21 @@ class DivisorTexto(QMainWindow):
         self.spin_max.valueChanged.connect(self.atualizar_limite_max)
         self.layout_limites.addWidget(self.spin_max)
         
+        self.layout_limites.addStretch()
+        
+        self.label_modo = QLabel("Modo:")
+        self.layout_limites.addWidget(self.label_modo)
+        
+        self.combo_modo = QComboBox()
+        for modo, nome in MODOS_DIVISAO.items():
+            self.combo_modo.addItem(nome, modo)
+        self.combo_modo.setCurrentIndex(list(MODOS_DIVISAO).index(self.modo_divisao))
+        self.combo_modo.setToolTip("Guloso corta no último ponto ou vírgula antes do limite máximo.\n"
+                                   "Equilibrado escolhe todos os cortes juntos, preferindo fins de frase "
+                                   "e trechos de tamanho parecido.")
+        self.combo_modo.currentIndexChanged.connect(self.atualizar_modo_divisao)
+        self.layout_limites.addWidget(self.combo_modo)
+        
         self.main_layout.addWidget(self.frame_limites)
         
         self.progress = QProgressBar(self)
@@ -224,6 +334,10 @@ class DivisorTexto(QMainWindow):
         abrir_action.triggered.connect(self.abrir_arquivo)
         file_menu.addAction(abrir_action)
         
+        dividir_arquivo_action = QAction("Dividir arquivo grande...", self)
+        dividir_arquivo_action.triggered.connect(self.dividir_arquivo)
+        file_menu.addAction(dividir_arquivo_action)
+        
         salvar_action = QAction("Salvar resultado como...", self)
         salvar_action.setShortcut("Ctrl+S")
         salvar_action.triggered.connect(self.salvar_arquivo)
@@ -254,6 +368,14 @@ class DivisorTexto(QMainWindow):
         substituir_verbos_action.triggered.connect(self.substituir_verbos)
         edit_menu.addAction(substituir_verbos_action)
         
+        recarregar_regras_action = QAction("Recarregar regras de substituição", self)
+        recarregar_regras_action.triggered.connect(self.carregar_regras)
+        edit_menu.addAction(recarregar_regras_action)
+        
+        escolher_regras_action = QAction("Escolher arquivo de regras...", self)
+        escolher_regras_action.triggered.connect(self.escolher_arquivo_regras)
+        edit_menu.addAction(escolher_regras_action)
+        
         config_menu = menubar.addMenu("Configurações")
         
         fonte_entrada_action = QAction("Fonte da área de entrada...", self)
@@ -307,124 +429,247 @@ class DivisorTexto(QMainWindow):
         toolbar.addAction(copiar_action)
     
     def dividir_texto(self, texto, limite_min=1300, limite_max=1500):
-        trechos = []
-        inicio = 0
-
-        while inicio < len(texto):
-            fim = min(inicio + limite_max, len(texto))
-            ultimo_ponto = texto.rfind('.', inicio, fim)
-            ultima_virgula = texto.rfind(',', inicio, fim)
-            fim_trecho = max(ultimo_ponto, ultima_virgula)
-            
-            if fim_trecho == -1 or fim_trecho < inicio + limite_min:
-                fim_trecho = fim
-            
-            trecho = texto[inicio:fim_trecho + 1].strip()
-            if trecho:
-                trechos.append(trecho)
-            
-            inicio = fim_trecho + 1
-
-        return trechos
+        return dividir_texto(texto, limite_min, limite_max)
     
-    def substituir_verbos_mais_que_perfeito(self, texto):
-        substituicoes = {
-            'deixara': 'deixou', 'acabara': 'acabou', 'ficara': 'ficou',
-            'usara': 'usou', 'acontecera': 'aconteceu', 'ouvira': 'ouviu',
-            'imaginara': 'imaginou', 'sentira': 'sentiu', 'fizera': 'fez',
-            'transformara': 'transformou', 'dissera': 'disse', 'interessara': 'interessou',
-            'criara': 'criou', 'ignorara': 'ignorou', 'soubera': 'soube',
-            'começara': 'começou', 'tivera': 'teve', 'ganhara': 'ganhou',
-            'escolhera': 'escolheu', 'salvara': 'salvou', 'aprendera': 'aprendeu',
-            'pedira': 'pediu', 'tornara': 'tornou', 'surgira': 'surgiu' , 'ouvirá': 'ouviu'
-            , 'gostara': 'gostou'
-        }
-        
-        def substituir_preservando_caso(match):
-            palavra = match.group(0)
-            palavra_lower = palavra.lower()
-            
-            if palavra_lower in substituicoes:
-                substituicao = substituicoes[palavra_lower]
-                
-                if palavra.istitle():
-                    return substituicao.title()
-                elif palavra.isupper():
-                    return substituicao.upper()
-                else:
-                    return substituicao
-            
-            return palavra
-        
-        padrao = r'\b(' + '|'.join(re.escape(palavra) for palavra in substituicoes.keys()) + r')\b'
-        texto_modificado = re.sub(padrao, substituir_preservando_caso, texto, flags=re.IGNORECASE)
+    def carregar_regras(self):
+        """Lê a tabela de substituições uma vez; editar o arquivo exige recarregar."""
+        try:
+            self.substituidor = SubstituidorVerbos.do_arquivo(self.arquivo_regras)
+            self.status_bar.showMessage(f"{len(self.substituidor.regras)} regras de substituição carregadas.")
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao carregar as regras de substituição: {str(e)}")
+    
+    def escolher_arquivo_regras(self):
+        arquivo, _ = QFileDialog.getOpenFileName(
+            self, "Arquivo de regras", os.path.dirname(self.arquivo_regras), 
+            "Regras JSON (*.json);;Todos os arquivos (*)"
+        )
         
-        return texto_modificado, substituicoes
+        if arquivo:
+            self.arquivo_regras = arquivo
+            self.settings.setValue("arquivo_regras", arquivo)
+            self.carregar_regras()
+    
+    def substituir_verbos_mais_que_perfeito(self, texto):
+        texto_modificado, _ = self.substituidor.substituir(texto)
+        return texto_modificado, self.substituidor.regras
     
     def substituir_verbos_automaticamente(self):
-        texto = self.entrada_texto.toPlainText().strip()
+        texto = self.entrada_texto.toPlainText()
         
-        if not texto:
+        if not texto.strip():
             return
         
-        texto_modificado, substituicoes = self.substituir_verbos_mais_que_perfeito(texto)
+        texto_modificado, contagens = self.substituidor.substituir(texto)
+        
+        # O documento inteiro acabou de ser verificado; as edições pendentes não precisam ser relidas
+        self.alteracao_inicio = self.alteracao_fim = None
+        self.invalidar_previsao()
+        if not contagens:
+            self.status_bar.showMessage("Nenhuma palavra foi substituída.")
+            return
         
+        # Só reescreve o editor quando algo mudou, mantendo o cursor perto de onde estava
+        posicao = self.entrada_texto.textCursor().position()
         self.entrada_texto.blockSignals(True)
         self.entrada_texto.setPlainText(texto_modificado)
         self.entrada_texto.blockSignals(False)
+        cursor = self.entrada_texto.textCursor()
+        cursor.setPosition(min(posicao, len(texto_modificado)))
+        self.entrada_texto.setTextCursor(cursor)
+        self.alteracao_inicio = self.alteracao_fim = None
+        self.mostrar_substituicoes(contagens)
+    
+    def substituir_trecho_alterado(self):
+        """Aplica as regras só às palavras em volta do que mudou desde a última pausa na digitação."""
+        if self.alteracao_inicio is None:
+            return
         
-        palavras_substituidas = []
-        for palavra_original, palavra_substituta in substituicoes.items():
-            if re.search(r'\b' + re.escape(palavra_original) + r'\b', texto, flags=re.IGNORECASE):
-                palavras_substituidas.append(f"{palavra_original} -> {palavra_substituta}")
+        documento = self.entrada_texto.document()
+        total = documento.characterCount() - 1
+        inicio = max(min(self.alteracao_inicio, total) - MARGEM_SUBSTITUICAO, 0)
+        fim = min(self.alteracao_fim + MARGEM_SUBSTITUICAO, total)
+        cursor = QTextCursor(documento)
+        cursor.setPosition(inicio)
+        cursor.setPosition(fim, QTextCursor.KeepAnchor)
+        trecho = cursor.selectedText().replace('\u2029', '\n')
+        if len(trecho) != fim - inicio:
+            # Posições do Qt contam em UTF-16; com emojis e afins elas não batem com o texto em Python
+            self.substituir_verbos_automaticamente()
+            return
         
-        if palavras_substituidas:
-            mensagem = f"{len(palavras_substituidas)} palavra(s) foram substituídas:\n\n"
-            mensagem += "\n".join(palavras_substituidas)
-            self.status_bar.showMessage(mensagem)
-        else:
-            self.status_bar.showMessage("Nenhuma palavra foi substituída.")
+        # As palavras cortadas nas bordas da janela não foram editadas e ficam de fora
+        esquerda, direita = 0, len(trecho)
+        if inicio > 0:
+            borda = re.search(r'\W', trecho)
+            esquerda = borda.end() if borda else direita
+        if fim < total:
+            borda = re.search(r'\W\w*$', trecho)
+            direita = borda.start() if borda else esquerda
+        trocas = self.substituidor.trocas(trecho[esquerda:max(esquerda, direita)])
+        if not trocas:
+            return
+        
+        # Troca palavra a palavra, de trás para frente, num único passo de desfazer; o cursor
+        # do usuário é ajustado pelo próprio Qt
+        contagens = Counter()
+        cursor.beginEditBlock()
+        for comeco, final, substituta in reversed(trocas):
+            cursor.setPosition(inicio + esquerda + comeco)
+            cursor.setPosition(inicio + esquerda + final, QTextCursor.KeepAnchor)
+            contagens[cursor.selectedText().lower()] += 1
+            cursor.insertText(substituta)
+        cursor.endEditBlock()
+        self.mostrar_substituicoes(contagens)
+    
+    def mostrar_substituicoes(self, contagens):
+        palavras_substituidas = [
+            f"{palavra} -> {self.substituidor.regras[palavra]} ({quantidade}x)"
+            for palavra, quantidade in contagens.most_common()
+        ]
+        mensagem = f"{len(palavras_substituidas)} palavra(s) foram substituídas:\n\n"
+        mensagem += "\n".join(palavras_substituidas)
+        self.status_bar.showMessage(mensagem)
     
     def substituir_verbos(self):
         self.substituir_verbos_automaticamente()
     
     def processar_texto(self):
+        # Aplica as substituições ainda pendentes do que acabou de ser digitado
+        if self.timer_estatisticas.isActive():
+            self.atualizar_estatisticas()
         texto = self.entrada_texto.toPlainText().strip()
         
         if not texto:
             QMessageBox.warning(self, "Aviso", "Por favor, insira um texto para dividir.")
             return
         
-        self.progress.setValue(50)
-        trechos = self.dividir_texto(texto, self.limite_min, self.limite_max)
-        self.progress.setValue(100)
+        if self.modo_divisao == "equilibrado":
+            trechos = iter(dividir_equilibrado(texto, self.limite_min, self.limite_max))
+        else:
+            trechos = dividir_em_trechos([texto], self.limite_min, self.limite_max)
+        self.iniciar_divisao(trechos, len(texto))
+    
+    def dividir_arquivo(self):
+        """Divide um arquivo direto do disco, sem passar pela área de entrada."""
+        arquivo, _ = QFileDialog.getOpenFileName(
+            self, "Dividir arquivo de texto", "", 
+            "Arquivos de texto (*.txt);;Todos os arquivos (*)"
+        )
         
-        self.saida_texto.clear()
-        total_caracteres = 0
+        if not arquivo:
+            return
         
-        for i, trecho in enumerate(trechos, 1):
-            self.saida_texto.append(f"Trecho {i} ({len(trecho)} caracteres):\n{trecho}\n\n")
-            total_caracteres += len(trecho)
+        if self.modo_divisao == "equilibrado":
+            # O modo equilibrado escolhe os cortes olhando o texto inteiro, então o arquivo é lido de uma vez
+            try:
+                texto = ''.join(aparar(ler_blocos(arquivo)))
+            except (OSError, UnicodeDecodeError) as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao ler o arquivo: {str(e)}")
+                return
+            trechos = iter(dividir_equilibrado(texto, self.limite_min, self.limite_max))
+        else:
+            trechos = dividir_em_trechos(aparar(ler_blocos(arquivo)), self.limite_min, self.limite_max)
+        self.iniciar_divisao(trechos, os.path.getsize(arquivo))
+    
+    def iniciar_divisao(self, trechos, tamanho):
+        # O gerador é consumido em lotes pelo timer para a janela continuar respondendo
+        self.timer_divisao.stop()
+        self.modelo_trechos.limpar()
+        self.gerador_trechos = trechos
+        self.tamanho_entrada = max(tamanho, 1)
+        self.progress.setValue(0)
+        self.dividir_btn.setEnabled(False)
+        self.timer_divisao.start(0)
+    
+    def continuar_divisao(self):
+        try:
+            lote = list(islice(self.gerador_trechos, TRECHOS_POR_LOTE))
+        except (OSError, UnicodeDecodeError) as e:
+            self.timer_divisao.stop()
+            self.dividir_btn.setEnabled(True)
+            QMessageBox.critical(self, "Erro", f"Erro ao ler o arquivo: {str(e)}")
+            return
         
-        self.saida_texto.append(f"Total de caracteres: {total_caracteres}")
-        self.status_bar.showMessage(f"Texto dividido em {len(trechos)} trechos.")
+        self.modelo_trechos.adicionar(lote)
+        self.progress.setValue(min(99, self.modelo_trechos.total_caracteres * 100 // self.tamanho_entrada))
+        if len(lote) == TRECHOS_POR_LOTE:
+            return
+        
+        self.timer_divisao.stop()
+        self.gerador_trechos = None
+        self.dividir_btn.setEnabled(True)
+        self.progress.setValue(100)
+        estatisticas = estatisticas_trechos(self.modelo_trechos.trechos)
+        if estatisticas['trechos']:
+            self.status_bar.showMessage(
+                f"Texto dividido em {estatisticas['trechos']} trechos ({MODOS_DIVISAO[self.modo_divisao]}): "
+                f"mín. {estatisticas['minimo']}, máx. {estatisticas['maximo']}, média {estatisticas['media']:.0f}, "
+                f"desvio {estatisticas['desvio']:.0f}, {estatisticas['terminam_em_frase']:.0%} terminam em fim de frase."
+            )
+        else:
+            self.status_bar.showMessage("Texto dividido em 0 trechos.")
         
         # Oculta a janela principal antes de mostrar o pop-up
         self.hide()
-        self.abrir_popup_copiar(trechos)
+        self.abrir_popup_copiar()
     
-    def abrir_popup_copiar(self, trechos):
-        popup = CopiarTrechosDialog(trechos, self)
+    def abrir_popup_copiar(self):
+        popup = CopiarTrechosDialog(self.modelo_trechos, self)
         popup.exec_()
     
+    def registrar_alteracao(self, posicao, removidos, adicionados):
+        """Guarda onde o texto mudou; substituição e recontagem esperam o usuário parar de digitar."""
+        if self.gerador_carregamento is not None:
+            return
+        if self.alteracao_inicio is None:
+            self.alteracao_inicio, self.alteracao_fim = posicao, posicao + adicionados
+        else:
+            if posicao <= self.alteracao_fim:
+                self.alteracao_fim = max(self.alteracao_fim + adicionados - removidos, posicao + adicionados)
+            else:
+                self.alteracao_fim = posicao + adicionados
+            self.alteracao_inicio = min(self.alteracao_inicio, posicao)
+        self.atualizar_contagem_caracteres()
+        self.timer_estatisticas.start()
+    
     def atualizar_contagem_caracteres(self):
+        # characterCount não copia o documento; ele conta também o separador do último parágrafo
+        caracteres = self.entrada_texto.document().characterCount() - 1
+        self.label_caracteres_entrada.setText(
+            f"Caracteres: {caracteres} | Palavras: {self.palavras} | Trechos previstos: {self.trechos_previstos}"
+        )
+    
+    def atualizar_estatisticas(self):
+        self.substituir_trecho_alterado()
+        # As trocas acima também passam por registrar_alteracao e entram nesta mesma recontagem
+        self.timer_estatisticas.stop()
         texto = self.entrada_texto.toPlainText()
-        self.label_caracteres_entrada.setText(f"Caracteres: {len(texto)}")
+        alterado_em = self.alteracao_inicio or 0
+        self.alteracao_inicio = self.alteracao_fim = None
+        if len(texto) != self.entrada_texto.document().characterCount() - 1:
+            # Posições do Qt contam em UTF-16; com emojis e afins elas não batem com o texto em Python
+            alterado_em = 0
+        
+        self.palavras = len(texto.split())
+        self.cortes_previstos = cortes_gulosos(
+            texto, self.limite_min, self.limite_max, self.cortes_previstos, alterado_em
+        )
+        if self.modo_divisao == "equilibrado":
+            # O modo equilibrado precisa do texto inteiro; a previsão usa o tamanho médio dos trechos
+            tamanho = len(texto.strip())
+            self.trechos_previstos = math.ceil(tamanho / ((self.limite_min + self.limite_max) / 2))
+        else:
+            self.trechos_previstos = len(self.cortes_previstos)
+        self.atualizar_contagem_caracteres()
+    
+    def invalidar_previsao(self):
+        self.cortes_previstos = None
+        self.timer_estatisticas.start()
     
     def limpar_campos(self):
         self.entrada_texto.clear()
-        self.saida_texto.clear()
-        self.label_caracteres_entrada.setText("Caracteres: 0")
+        self.modelo_trechos.limpar()
         self.status_bar.showMessage("Campos limpos.")
     
     def alternar_tema(self):
@@ -462,6 +707,7 @@ class DivisorTexto(QMainWindow):
             self.spin_max.setValue(valor)
         
         self.settings.setValue("limite_min", valor)
+        self.invalidar_previsao()
     
     def atualizar_limite_max(self, valor):
         self.limite_max = valor
@@ -471,6 +717,12 @@ class DivisorTexto(QMainWindow):
             self.spin_min.setValue(valor)
         
         self.settings.setValue("limite_max", valor)
+        self.invalidar_previsao()
+    
+    def atualizar_modo_divisao(self, indice):
+        self.modo_divisao = self.combo_modo.itemData(indice)
+        self.settings.setValue("modo_divisao", self.modo_divisao)
+        self.invalidar_previsao()
     
     def abrir_arquivo(self):
         options = QFileDialog.Options()
@@ -480,19 +732,62 @@ class DivisorTexto(QMainWindow):
             options=options
         )
         
-        if arquivo:
-            try:
-                with open(arquivo, 'r', encoding='utf-8') as f:
-                    texto = f.read()
-                self.entrada_texto.setPlainText(texto)
-                self.status_bar.showMessage(f"Arquivo aberto: {arquivo}")
-            except Exception as e:
-                QMessageBox.critical(self, "Erro", f"Erro ao abrir o arquivo: {str(e)}")
+        if not arquivo:
+            return
+        
+        try:
+            encoding = detectar_encoding_arquivo(arquivo)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao abrir o arquivo: {str(e)}")
+            return
+        
+        # O texto entra no editor em blocos pelo timer; enquanto houver gerador, registrar_alteracao
+        # ignora os blocos e a substituição de verbos e a recontagem rodam uma vez no fim
+        self.timer_carregamento.stop()
+        self.gerador_carregamento = ler_blocos(arquivo, BLOCO_CARREGAMENTO, encoding)
+        self.entrada_texto.setUndoRedoEnabled(False)
+        self.entrada_texto.setReadOnly(True)
+        self.entrada_texto.clear()
+        self.dividir_btn.setEnabled(False)
+        self.arquivo_carregando = (arquivo, encoding)
+        self.tamanho_carregando = max(os.path.getsize(arquivo), 1)
+        self.progress.setValue(0)
+        self.timer_carregamento.start(0)
     
-    def salvar_arquivo(self):
-        texto = self.saida_texto.toPlainText()
+    def continuar_carregamento(self):
+        arquivo, encoding = self.arquivo_carregando
+        try:
+            bloco = next(self.gerador_carregamento, None)
+        except (OSError, UnicodeDecodeError) as e:
+            self.terminar_carregamento()
+            QMessageBox.critical(self, "Erro", f"Erro ao abrir o arquivo ({encoding}): {str(e)}")
+            return
         
-        if not texto:
+        if bloco is not None:
+            cursor = self.entrada_texto.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(bloco)
+            carregados = self.entrada_texto.document().characterCount()
+            self.progress.setValue(min(99, carregados * 100 // self.tamanho_carregando))
+            return
+        
+        self.terminar_carregamento()
+        self.progress.setValue(100)
+        self.entrada_texto.moveCursor(QTextCursor.Start)
+        self.substituir_verbos_automaticamente()
+        self.status_bar.showMessage(f"Arquivo aberto: {arquivo} ({encoding})")
+    
+    def terminar_carregamento(self):
+        self.timer_carregamento.stop()
+        self.gerador_carregamento = None
+        self.entrada_texto.setReadOnly(False)
+        self.entrada_texto.setUndoRedoEnabled(True)
+        self.dividir_btn.setEnabled(True)
+        self.alteracao_inicio = self.alteracao_fim = None
+        self.invalidar_previsao()
+    
+    def salvar_arquivo(self):
+        if not self.modelo_trechos.trechos:
             QMessageBox.warning(self, "Aviso", "Não há texto para salvar.")
             return
             
@@ -505,21 +800,21 @@ class DivisorTexto(QMainWindow):
         
         if arquivo:
             try:
+                # Grava trecho a trecho, sem montar o resultado inteiro na memória
                 with open(arquivo, 'w', encoding='utf-8') as f:
-                    f.write(texto)
+                    for i, parte in enumerate(self.modelo_trechos.partes_resultado()):
+                        f.write(parte if i == 0 else "\n" + parte)
                 self.status_bar.showMessage(f"Resultado salvo em: {arquivo}")
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao salvar o arquivo: {str(e)}")
     
     def copiar_resultado(self):
-        texto = self.saida_texto.toPlainText()
-        
-        if not texto:
+        if not self.modelo_trechos.trechos:
             self.status_bar.showMessage("Não há texto para copiar.")
             return
             
         clipboard = QApplication.clipboard()
-        clipboard.setText(texto)
+        clipboard.setText("\n".join(self.modelo_trechos.partes_resultado()))
         self.status_bar.showMessage("Texto copiado para a área de transferência.")
     
     def escolher_fonte_entrada(self):
@@ -534,7 +829,7 @@ class DivisorTexto(QMainWindow):
         ok, fonte = QFontDialog.getFont(self.fonte_saida, self)
         if ok:
             self.fonte_saida = fonte
-            self.saida_texto.setFont(fonte)
+            self.saida_trechos.setFont(fonte)
             self.settings.setValue("fonte_saida", fonte.family())
             self.settings.setValue("tamanho_fonte_saida", fonte.pointSize())
     
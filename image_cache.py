@@ -0,0 +1,212 @@
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from slicer_profiling import timer
+
+
+def image_nbytes(image):
+    return image.size[0] * image.size[1] * len(image.getbands())
+
+
+class LRUCache:
+    def __init__(self, budget_bytes, sizeof=image_nbytes):
+        self.budget_bytes = budget_bytes
+        self.sizeof = sizeof
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # A decodificação acontece fora do lock para não bloquear outras leituras
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def put(self, key, value):
+        nbytes = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.used_bytes += nbytes
+
+            # A entrada mais recente sempre fica, mesmo que sozinha estoure o orçamento
+            while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_bytes
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self.used_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats_text(self):
+        return (f"Cache: {len(self._entries)} itens, {self.used_bytes / 2**20:.0f}/{self.budget_bytes / 2**20:.0f} MB, "
+                f"{self.hits} acertos, {self.misses} falhas")
+
+
+def read_image_info(path):
+    # Image.open só lê o cabeçalho; os pixels ficam para quando a imagem for exibida
+    with Image.open(path) as image:
+        return image.size
+
+
+def decode_image(path, crop_box=None):
+    image = Image.open(path)
+    with timer.stage('decodificar'):
+        image.load()
+    if crop_box is not None:
+        image = image.crop(crop_box)
+    return image
+
+
+class ImageCache(LRUCache):
+    def get_image(self, path, crop_box=None):
+        return self.get((path, crop_box), lambda: decode_image(path, crop_box))
+
+
+def build_pyramid(image, min_side=64):
+    # Cada nível tem metade do anterior; a imagem original não entra na pirâmide
+    levels = []
+    level = image
+    while min(level.size) // 2 >= min_side:
+        level = level.reduce(2)
+        levels.append(level)
+    return levels
+
+
+def pyramid_nbytes(levels):
+    return sum(image_nbytes(level) for level in levels)
+
+
+def covers(image, size):
+    return image.size[0] >= size[0] and image.size[1] >= size[1]
+
+
+def pick_level(levels, size):
+    # Menor nível que ainda cobre o tamanho pedido; None quando só o original serve
+    source = None
+    for level in levels:
+        if not covers(level, size):
+            break
+        source = level
+    return source
+
+
+def decode_preview(path, crop_box, size):
+    # JPEG pode ser decodificado direto em 1/2, 1/4 ou 1/8 da resolução com Image.draft;
+    # para os outros formatos não há decodificação reduzida e o chamador usa o original
+    image = Image.open(path)
+    full_width, full_height = image.size
+    left, top, right, bottom = crop_box or (0, 0, full_width, full_height)
+    scale = max(size[0] / (right - left), size[1] / (bottom - top))
+    if image.format != 'JPEG' or scale > 0.5:
+        image.close()
+        return None
+
+    image.draft('RGB', (math.ceil(full_width * scale), math.ceil(full_height * scale)))
+    with timer.stage('decodificar draft'):
+        image.load()
+    if crop_box is not None:
+        factor = image.size[0] / full_width
+        image = image.crop((round(left * factor), round(top * factor), round(right * factor), round(bottom * factor)))
+    return image
+
+
+class PreviewCache(LRUCache):
+    def __init__(self, budget_bytes, image_cache):
+        super().__init__(budget_bytes, sizeof=pyramid_nbytes)
+        self.image_cache = image_cache
+
+    def build_levels(self, path, crop_box, size):
+        # Folga de 2x para que pequenos redimensionamentos da janela não exijam nova decodificação
+        draft = decode_preview(path, crop_box, (size[0] * 2, size[1] * 2))
+        if draft is not None:
+            return [draft] + build_pyramid(draft)
+        return build_pyramid(self.image_cache.get_image(path, crop_box))
+
+    def get_pyramid(self, path, crop_box, size):
+        key = (path, crop_box)
+        levels = self.get(key, lambda: self.build_levels(path, crop_box, size))
+        if pick_level(levels, size) is None:
+            # Uma pirâmide feita de um rascunho pequeno demais é refeita numa escala maior, se houver
+            draft = decode_preview(path, crop_box, size)
+            if draft is not None:
+                levels = [draft] + build_pyramid(draft)
+                self.put(key, levels)
+        return levels
+
+    def render(self, path, crop_box, size, resample=Image.Resampling.LANCZOS):
+        source = pick_level(self.get_pyramid(path, crop_box, size), size)
+        if source is None:
+            source = self.image_cache.get_image(path, crop_box)
+        return source.resize(size, resample)
+
+    def render_region(self, path, crop_box, source_size, box, size, resample=Image.Resampling.BILINEAR):
+        # box está em pixels da imagem recortada (source_size); usa o menor nível com resolução suficiente
+        zoom = size[0] / (box[2] - box[0])
+        needed = (math.ceil(source_size[0] * zoom), math.ceil(source_size[1] * zoom))
+        source = pick_level(self.get_pyramid(path, crop_box, needed), needed)
+        if source is None:
+            source = self.image_cache.get_image(path, crop_box)
+
+        level_scale = source.size[0] / source_size[0]
+        limits = source.size * 2
+        scaled_box = tuple(min(coord * level_scale, limit) for coord, limit in zip(box, limits))
+        return source.resize(size, resample, box=scaled_box)
+
+
+class Prefetcher:
+    def __init__(self, preview_cache):
+        self.preview_cache = preview_cache
+        self.results = queue.Queue()
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def schedule(self, requests):
+        # Cada navegação substitui os pedidos anteriores, que já ficaram obsoletos
+        with self._condition:
+            self._pending = list(requests)
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                key, path, crop_box, size = self._pending.pop(0)
+
+            try:
+                image = self.preview_cache.render(path, crop_box, size)
+            except Exception:
+                continue
+            self.results.put((key, image))
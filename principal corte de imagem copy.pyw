@@ -4,7 +4,26 @@ from PIL import Image, ImageTk
 import os
 import json
 import platform
-import copy
+import threading
+import queue
+import time
+import argparse
+
+from slicer_engine import (
+    has_valid_slices, sequence_name, make_job, run_batch, default_workers, detect_gutters,
+    compose_crop, crop_size, VirtualStrip, run_recut, make_profile, EXPORT_FORMATS, auto_slices, plan_strip,
+    output_ext
+)
+from image_cache import ImageCache, PreviewCache, Prefetcher, LRUCache, read_image_info, decode_image
+from async_io import BackgroundIO, format_error_report
+from thumbnail_cache import ThumbnailCache, ThumbnailWorker, DEFAULT_CACHE_FOLDER
+from slicer_project import ProjectJournal, DEFAULT_PROJECT_PATH
+from slicer_profiling import timer, SessionProfiler
+
+TILE_SIZE = 512
+THUMBNAIL_SIZE = (80, 120)
+# Configuração da versão aprimorada; só a qualidade de imagem ainda é aproveitada dela
+LEGACY_CONFIG_FILE = 'image_slicer_enhanced.json'
 
 class ConfigManager:
     def __init__(self, config_file='image_slicer_config.json'):
@@ -12,25 +31,66 @@ class ConfigManager:
         self.config = self.load_config()
 
     def load_config(self):
+        config = self.default_config()
         try:
             with open(self.config_file, 'r') as f:
-                return json.load(f)
+                loaded = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            return {
-                'hotkeys': {
-                    'add_images': '<Control-o>',
-                    'slice_images': '<Control-s>',
-                    'clear_slices': '<Control-c>',
-                    'toggle_cut_mode': '<Control-m>',
-                    'next_image': '<Right>',
-                    'previous_image': '<Left>',
-                    'clear_all_images': '<Control-Delete>',
-                    'save_images': '<Control-Shift-s>',
-                    'undo_vertical': '<Control-z>'
-                },
-                'theme': 'dark',
-                'auto_save': True
-            }
+            loaded = {}
+        # Arquivos de versões anteriores não têm as chaves e atalhos novos; os padrões completam o que faltar
+        for key, value in loaded.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key] = {**config[key], **value}
+            else:
+                config[key] = value
+        if 'image_quality' not in config:
+            config['image_quality'] = self.legacy_image_quality()
+        return config
+
+    def legacy_image_quality(self):
+        path = os.path.join(os.path.dirname(self.config_file), LEGACY_CONFIG_FILE)
+        try:
+            with open(path, 'r') as f:
+                return int(json.load(f).get('image_quality', 95))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return 95
+
+    def default_config(self):
+        return {
+            'hotkeys': {
+                'add_images': '<Control-o>',
+                'slice_images': '<Control-s>',
+                'clear_slices': '<Control-c>',
+                'toggle_cut_mode': '<Control-m>',
+                'next_image': '<Right>',
+                'previous_image': '<Left>',
+                'clear_all_images': '<Control-Delete>',
+                'save_images': '<Control-Shift-s>',
+                'undo_vertical': '<Control-z>',
+                'redo_vertical': '<Control-y>',
+                'auto_cut': '<Control-g>',
+                'toggle_view_mode': '<Control-r>',
+                'toggle_profiling': '<F12>'
+            },
+            'theme': 'dark',
+            'auto_save': True,
+            'export_workers': default_workers(),
+            'auto_cut_on_load': False,
+            'cache_budget_mb': 512,
+            'preview_cache_mb': 256,
+            'prefetch_pages': 2,
+            'tile_cache_mb': 128,
+            'recut_height': 2000,
+            'export_profile': {'format': 'original'},
+            'io_concurrency': 8,
+            'thumbnail_cache_dir': DEFAULT_CACHE_FOLDER,
+            'incremental_export': False,
+            'auto_slice': {'scope': 'image', 'mode': 'height', 'height': 2000, 'kb': 800, 'snap_rows': 150}
+        }
+
+    def export_profile(self):
+        # image_quality é a qualidade padrão; o perfil de exportação pode sobrescrevê-la
+        return make_profile({'quality': self.config.get('image_quality', 95), **self.config.get('export_profile', {})})
 
     def save_config(self):
         with open(self.config_file, 'w') as f:
@@ -50,7 +110,11 @@ class ConfigManager:
             'previous_image': 'Imagem Anterior',
             'clear_all_images': 'Limpar Todas as Imagens',
             'save_images': 'Salvar Imagens',
-            'undo_vertical': 'Desfazer Corte Vertical'
+            'undo_vertical': 'Desfazer Corte Vertical',
+            'redo_vertical': 'Refazer Corte Vertical',
+            'auto_cut': 'Auto-cortar',
+            'toggle_view_mode': 'Alternar Modo de Rolagem',
+            'toggle_profiling': 'Mostrar Tempos de Execução'
         }
 
         def on_hotkey_change(key):
@@ -67,7 +131,7 @@ class ConfigManager:
             ttk.Label(hotkey_window, text=label).grid(row=i, column=0, padx=10, pady=5)
             entry = ttk.Button(
                 hotkey_window, 
-                text=self.config['hotkeys'][key], 
+                text=self.config['hotkeys'].get(key, ''), 
                 command=lambda k=key: on_hotkey_change(k)
             )
             entry.grid(row=i, column=1, padx=10, pady=5)
@@ -99,7 +163,7 @@ class ConfigManager:
     def save_preferences(self, root):
         preferences_window = tk.Toplevel(root)
         preferences_window.title("Preferências do Aplicativo")
-        preferences_window.geometry("400x300")
+        preferences_window.geometry("400x650")
 
         ttk.Label(preferences_window, text="Tema").pack(pady=(10, 5))
         theme_var = tk.StringVar(value=self.config.get('theme', 'dark'))
@@ -119,9 +183,55 @@ class ConfigManager:
         )
         auto_save_check.pack(pady=10)
 
+        profile = self.export_profile()
+        export_frame = ttk.LabelFrame(preferences_window, text="Exportação")
+        export_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        format_var = tk.StringVar(value=profile['format'])
+        quality_var = tk.IntVar(value=profile['quality'])
+        progressive_var = tk.BooleanVar(value=profile['progressive'])
+        optimize_var = tk.BooleanVar(value=profile['optimize'])
+        compress_var = tk.IntVar(value=profile['compress_level'])
+        palette_var = tk.IntVar(value=profile['palette_colors'])
+        lossless_var = tk.BooleanVar(value=profile['lossless'])
+        incremental_var = tk.BooleanVar(value=self.config.get('incremental_export', False))
+
+        ttk.Label(export_frame, text="Formato").pack(pady=(5, 0))
+        ttk.Combobox(
+            export_frame, 
+            textvariable=format_var, 
+            values=list(EXPORT_FORMATS), 
+            state='readonly'
+        ).pack(pady=5)
+        ttk.Label(export_frame, text="Qualidade JPEG/WebP (1-100)").pack()
+        ttk.Spinbox(export_frame, from_=1, to=100, textvariable=quality_var, width=6).pack(pady=5)
+        ttk.Checkbutton(export_frame, text="JPEG progressivo", variable=progressive_var).pack()
+        ttk.Checkbutton(export_frame, text="Otimizar JPEG/PNG (mais lento)", variable=optimize_var).pack()
+        ttk.Label(export_frame, text="Compressão PNG (0-9)").pack()
+        ttk.Spinbox(export_frame, from_=0, to=9, textvariable=compress_var, width=6).pack(pady=5)
+        ttk.Label(export_frame, text="Cores da paleta PNG (0 = sem quantizar)").pack()
+        ttk.Spinbox(export_frame, from_=0, to=256, textvariable=palette_var, width=6).pack(pady=5)
+        ttk.Checkbutton(export_frame, text="WebP sem perdas", variable=lossless_var).pack()
+        ttk.Checkbutton(
+            export_frame, 
+            text="Exportação incremental (só grava o que mudou)", 
+            variable=incremental_var
+        ).pack(pady=(0, 5))
+
         def save_preferences():
             self.config['theme'] = theme_var.get()
             self.config['auto_save'] = auto_save_var.get()
+            self.config['image_quality'] = quality_var.get()
+            self.config['incremental_export'] = incremental_var.get()
+            self.config['export_profile'] = {
+                'format': format_var.get(),
+                'quality': quality_var.get(),
+                'progressive': progressive_var.get(),
+                'optimize': optimize_var.get(),
+                'compress_level': compress_var.get(),
+                'palette_colors': palette_var.get(),
+                'lossless': lossless_var.get()
+            }
             self.save_config()
             messagebox.showinfo("Sucesso", "Preferências salvas com sucesso!")
             preferences_window.destroy()
@@ -146,15 +256,44 @@ class ModernStyledImageSlicer:
         self.configure_modern_style()
 
         self.images = []
-        self.original_images = {}
+        self.image_cache = ImageCache(self.config.get('cache_budget_mb', 512) * 2**20)
+        self.preview_cache = PreviewCache(self.config.get('preview_cache_mb', 256) * 2**20, self.image_cache)
+        self.resize_job = None
+        self.fast_render_pending = False
+        self.canvas_size = None
+        self.prefetcher = Prefetcher(self.preview_cache)
+        self.ready_photos = {}
+        self.prefetch_wanted = set()
+        self.nav_direction = 1
+        self.view_mode = 'fit'
+        self.zoom_factor = 1.0  # Relativo ao ajuste pela largura no modo de rolagem
+        self.tile_cache = LRUCache(
+            self.config.get('tile_cache_mb', 128) * 2**20,
+            sizeof=lambda photo: photo.width() * photo.height() * 4
+        )
+        self.tile_render_pending = False
+        self.placeholder_tiles = []
+        self.background_io = BackgroundIO(self.config.get('io_concurrency', 8))
+        self.thumbnail_worker = ThumbnailWorker(
+            ThumbnailCache(self.config.get('thumbnail_cache_dir', DEFAULT_CACHE_FOLDER), THUMBNAIL_SIZE)
+        )
+        self.thumbnails = {}
         self.current_image_index = 0
         self.cut_mode = 'horizontal'
         self.active_slice_type = None
         self.sequence_start = 1  # Valor inicial da sequência
+        self.export_cancel = None
+        self.export_queue = queue.Queue()
+        self.project = None
+        self.profiling_overlay = False
 
         self.create_interface()
         self.setup_hotkeys()
         self.root.bind('<Configure>', self.on_window_resize)
+        self.root.after(50, self.poll_prefetch)
+        self.root.after(100, self.poll_thumbnails)
+        self.root.after(0, self.restore_session)
+        self.root.after(500, self.poll_profiling_overlay)
 
     def setup_theme(self):
         if platform.system() == 'Darwin':
@@ -178,10 +317,26 @@ class ModernStyledImageSlicer:
         image_frame = ttk.Frame(main_frame, borderwidth=2, relief='groove')
         image_frame.pack(fill=tk.BOTH, expand=True)
 
+        self.v_scrollbar = ttk.Scrollbar(image_frame, orient=tk.VERTICAL)
+        self.h_scrollbar = ttk.Scrollbar(image_frame, orient=tk.HORIZONTAL)
+
         self.image_canvas = tk.Canvas(image_frame, bg='white', highlightthickness=0, relief='flat')
         self.image_canvas.pack(fill=tk.BOTH, expand=True)
         self.image_canvas.bind('<Button-1>', self.add_slice_line)
         self.image_canvas.bind('<Motion>', self.show_hover_line)
+        self.image_canvas.config(
+            yscrollcommand=lambda first, last: self.on_canvas_scroll(self.v_scrollbar, first, last),
+            xscrollcommand=lambda first, last: self.on_canvas_scroll(self.h_scrollbar, first, last)
+        )
+        self.v_scrollbar.config(command=self.image_canvas.yview)
+        self.h_scrollbar.config(command=self.image_canvas.xview)
+
+        self.image_canvas.bind('<MouseWheel>', lambda event: self.on_mouse_wheel(-1 if event.delta > 0 else 1))
+        self.image_canvas.bind('<Button-4>', lambda event: self.on_mouse_wheel(-1))
+        self.image_canvas.bind('<Button-5>', lambda event: self.on_mouse_wheel(1))
+        self.image_canvas.bind('<Control-MouseWheel>', lambda event: self.change_zoom(1.25 if event.delta > 0 else 0.8))
+        self.image_canvas.bind('<Control-Button-4>', lambda event: self.change_zoom(1.25))
+        self.image_canvas.bind('<Control-Button-5>', lambda event: self.change_zoom(0.8))
 
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill=tk.X, pady=10)
@@ -202,6 +357,14 @@ class ModernStyledImageSlicer:
         )
         self.undo_vertical_btn.pack(side=tk.LEFT, padx=5)
         self.undo_vertical_btn.config(state=tk.DISABLED)
+
+        self.redo_vertical_btn = ttk.Button(
+            control_frame, 
+            text="↪️ Refazer Vertical", 
+            command=self.redo_vertical_cut
+        )
+        self.redo_vertical_btn.pack(side=tk.LEFT, padx=5)
+        self.redo_vertical_btn.config(state=tk.DISABLED)
         
         self.config_btn = ttk.Button(control_frame, text="⚙️ Configurações", command=self.open_config)
         self.config_btn.pack(side=tk.LEFT, padx=5)
@@ -209,6 +372,21 @@ class ModernStyledImageSlicer:
         self.mode_button = ttk.Button(control_frame, text="Corte Horizontal", command=self.toggle_cut_mode)
         self.mode_button.pack(side=tk.LEFT, padx=5)
 
+        self.auto_cut_btn = ttk.Button(control_frame, text="✂️ Auto-cortar", command=self.auto_cut_images)
+        self.auto_cut_btn.pack(side=tk.LEFT, padx=5)
+        self.auto_cut_btn.config(state=tk.DISABLED)
+
+        self.auto_slice_btn = ttk.Button(control_frame, text="📏 Fatiar por Tamanho", command=self.auto_slice_dialog)
+        self.auto_slice_btn.pack(side=tk.LEFT, padx=5)
+        self.auto_slice_btn.config(state=tk.DISABLED)
+
+        self.view_mode_btn = ttk.Button(control_frame, text="🔍 Modo Rolagem", command=self.toggle_view_mode)
+        self.view_mode_btn.pack(side=tk.LEFT, padx=5)
+
+        self.recut_btn = ttk.Button(control_frame, text="🧵 Recortar Capítulo", command=self.recut_chapter)
+        self.recut_btn.pack(side=tk.LEFT, padx=5)
+        self.recut_btn.config(state=tk.DISABLED)
+
         self.clear_all_images_btn = ttk.Button(control_frame, text="🗑️ Limpar Todas", command=self.clear_all_images)
         self.clear_all_images_btn.pack(side=tk.LEFT, padx=5)
 
@@ -227,6 +405,34 @@ class ModernStyledImageSlicer:
         self.next_btn = ttk.Button(nav_frame, text="▶", width=3, command=self.next_image)
         self.next_btn.pack(side=tk.RIGHT, padx=5)
 
+        filmstrip_frame = ttk.Frame(main_frame)
+        filmstrip_frame.pack(fill=tk.X)
+
+        self.filmstrip = tk.Canvas(
+            filmstrip_frame, height=THUMBNAIL_SIZE[1] + 10, bg='#2C2C2C', highlightthickness=0, relief='flat'
+        )
+        filmstrip_scrollbar = ttk.Scrollbar(filmstrip_frame, orient=tk.HORIZONTAL, command=self.filmstrip.xview)
+        self.filmstrip.config(xscrollcommand=filmstrip_scrollbar.set)
+        self.filmstrip.pack(fill=tk.X)
+        filmstrip_scrollbar.pack(fill=tk.X)
+        self.filmstrip.bind('<Button-1>', self.on_filmstrip_click)
+        self.filmstrip.bind('<MouseWheel>', lambda event: self.filmstrip.xview_scroll(-1 if event.delta > 0 else 1, 'units'))
+        self.filmstrip.bind('<Button-4>', lambda event: self.filmstrip.xview_scroll(-1, 'units'))
+        self.filmstrip.bind('<Button-5>', lambda event: self.filmstrip.xview_scroll(1, 'units'))
+
+        status_frame = ttk.Frame(main_frame)
+        status_frame.pack(fill=tk.X)
+
+        self.status_label = ttk.Label(status_frame, text="Pronto", anchor='w')
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.cache_label = ttk.Label(status_frame, text="", anchor='e')
+        self.cache_label.pack(side=tk.RIGHT, padx=5)
+
+        self.cancel_export_btn = ttk.Button(status_frame, text="⏹ Cancelar", command=self.cancel_export)
+        self.cancel_export_btn.pack(side=tk.RIGHT, padx=5)
+        self.cancel_export_btn.config(state=tk.DISABLED)
+
         self.slice_images_btn.config(state=tk.DISABLED)
         self.clear_slices_btn.config(state=tk.DISABLED)
         self.next_btn.config(state=tk.DISABLED)
@@ -234,16 +440,45 @@ class ModernStyledImageSlicer:
         self.save_images_btn.config(state=tk.DISABLED)
 
     def undo_vertical_cut(self):
-        if not self.images or self.current_image_index not in self.original_images:
+        if not self.images or not self.images[self.current_image_index]['crop_history']:
             return
 
+        # Cada passo do histórico é só um retângulo sobre o original; desfazer não copia pixels
         current_image = self.images[self.current_image_index]
-        current_image['image'] = copy.deepcopy(self.original_images[self.current_image_index])
+        current_image['redo_history'].append(current_image['crop_history'].pop())
         current_image['vertical_slices'].clear()
         self.active_slice_type = None
-        del self.original_images[self.current_image_index]
+        self.record_state()
         self.update_image_display()
-        self.undo_vertical_btn.config(state=tk.DISABLED if self.current_image_index not in self.original_images else tk.NORMAL)
+        self.update_undo_state()
+
+    def redo_vertical_cut(self):
+        if not self.images or not self.images[self.current_image_index]['redo_history']:
+            return
+
+        current_image = self.images[self.current_image_index]
+        current_image['crop_history'].append(current_image['redo_history'].pop())
+        current_image['vertical_slices'].clear()
+        self.active_slice_type = None
+        self.record_state()
+        self.update_image_display()
+        self.update_undo_state()
+
+    def update_undo_state(self):
+        current_image = self.images[self.current_image_index]
+        self.undo_vertical_btn.config(state=tk.NORMAL if current_image['crop_history'] else tk.DISABLED)
+        self.redo_vertical_btn.config(state=tk.NORMAL if current_image['redo_history'] else tk.DISABLED)
+
+    def crop_box(self, current_image):
+        return current_image['crop_history'][-1] if current_image['crop_history'] else None
+
+    def get_image(self, current_image):
+        image = self.image_cache.get_image(current_image['path'], self.crop_box(current_image))
+        self.cache_label.config(text=self.image_cache.stats_text())
+        return image
+
+    def image_size(self, current_image):
+        return crop_size(current_image['size'], self.crop_box(current_image))
 
     def save_images_without_slicing(self):
         if not self.images:
@@ -254,25 +489,218 @@ class ModernStyledImageSlicer:
         if not output_folder:
             return
 
-        for current_image in self.images:
-            image = current_image['image']
-            output_filename = current_image['display_name']
-            output_path = os.path.join(output_folder, output_filename)
-            
+        jobs = [self.export_job_for(current_image, None) for current_image in self.images]
+        self.start_export(jobs, output_folder, lambda stats: self.finish_export(
+            stats, f"Imagens salvas em {output_folder}"
+        ))
+
+    def update_status(self, text):
+        self.status_label.config(text=text)
+
+    def export_job_for(self, current_image, horizontal_slices):
+        return make_job(
+            current_image['path'],
+            current_image['display_name'],
+            horizontal_slices,
+            self.crop_box(current_image),
+            self.config_manager.export_profile()
+        )
+
+    def start_export(self, jobs, output_folder, on_finished):
+        workers = self.config.get('export_workers', default_workers())
+        incremental = self.config.get('incremental_export', False)
+        self.start_background(
+            lambda on_progress, cancel_event: run_batch(
+                jobs, output_folder, workers=workers, on_progress=on_progress, cancel_event=cancel_event,
+                incremental=incremental
+            ),
+            len(jobs), on_finished
+        )
+
+    def start_background(self, task, total, on_finished):
+        if self.export_cancel is not None:
+            messagebox.showwarning("Aviso", "Já existe uma exportação em andamento")
+            return
+
+        self.export_cancel = threading.Event()
+        cancel_event = self.export_cancel
+        self.set_export_controls(tk.DISABLED)
+        self.cancel_export_btn.config(state=tk.NORMAL)
+        self.update_status(f"Exportando 0/{total}...")
+
+        def worker():
+            stats = task(lambda done, total: self.export_queue.put(('progress', (done, total))), cancel_event)
+            self.export_queue.put(('finished', stats))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_export, on_finished)
+
+    def recut_chapter(self):
+        if not self.images:
+            messagebox.showwarning("Aviso", "Nenhuma imagem carregada")
+            return
+
+        segment_height = simpledialog.askinteger(
+            "Recortar Capítulo",
+            "Altura de cada pedaço (pixels):",
+            initialvalue=self.config.get('recut_height', 2000),
+            minvalue=1
+        )
+        if segment_height is None:
+            return
+
+        output_folder = filedialog.askdirectory(title="Selecione a pasta para salvar as imagens")
+        if not output_folder:
+            return
+
+        self.config['recut_height'] = segment_height
+        pages = [(image['path'], self.crop_box(image), self.image_size(image)) for image in self.images]
+        strip = VirtualStrip(pages)
+        segments = strip.uniform_segments(segment_height)
+        ext = os.path.splitext(self.images[0]['display_name'])[1]
+        profile = self.config_manager.export_profile()
+
+        self.start_background(
+            lambda on_progress, cancel_event: run_recut(
+                strip, segments, output_folder, ext, self.sequence_start, on_progress, cancel_event, profile
+            ),
+            len(segments),
+            lambda stats: self.finish_export(stats, f"Capítulo recortado em {stats['images']} pedaços em {output_folder}")
+        )
+
+    def poll_export(self, on_finished):
+        # O Tk só pode ser atualizado pela thread principal, então o progresso chega por fila
+        while True:
             try:
-                image.save(output_path)
-            except Exception as e:
-                messagebox.showerror("Erro", f"Não foi possível salvar {output_filename}: {str(e)}")
-                continue
+                kind, payload = self.export_queue.get_nowait()
+            except queue.Empty:
+                break
 
-        messagebox.showinfo("Sucesso", f"Imagens salvas em {output_folder}")
+            if kind == 'progress':
+                done, total = payload
+                self.update_status(f"Exportando {done}/{total}...")
+            else:
+                self.export_cancel = None
+                self.cancel_export_btn.config(state=tk.DISABLED)
+                self.set_export_controls(tk.NORMAL)
+                on_finished(payload)
+                return
+
+        self.root.after(100, self.poll_export, on_finished)
+
+    def cancel_export(self):
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+            self.update_status("Cancelando exportação...")
+
+    def set_export_controls(self, state):
+        for button in (self.slice_images_btn, self.save_images_btn, self.add_images_btn,
+                       self.clear_all_images_btn, self.recut_btn):
+            button.config(state=state)
+
+    def finish_export(self, stats, success_message):
+        # A codificação roda nos processos de exportação; os tempos voltam nas estatísticas
+        timer.record('exportar', stats['elapsed'])
+        for record in stats['files']:
+            timer.record('salvar', record['encode_seconds'])
+        average_ms = stats['encode_seconds'] / stats['slices'] * 1000 if stats['slices'] else 0
+        summary = (f"{stats['images']} imagens exportadas em {stats['elapsed']:.1f}s: {stats['slices']} arquivos, "
+                   f"{stats['bytes'] / 2**20:.1f} MB, {average_ms:.0f} ms de codificação por arquivo")
+        if stats['unchanged'] or stats['deleted']:
+            summary += f", {stats['unchanged']} sem alteração, {stats['deleted']} órfãos removidos"
+        if stats['cancelled']:
+            self.update_status(f"Exportação cancelada: {summary}")
+            return False
+
+        self.update_status(summary)
+        if stats['errors']:
+            messagebox.showerror(
+                "Erro",
+                f"Não foi possível exportar {len(stats['errors'])} imagem(ns):\n\n{format_error_report(stats['errors'])}"
+            )
+        else:
+            messagebox.showinfo("Sucesso", success_message)
+        return True
 
     def open_config(self):
         config_menu = tk.Menu(self.root, tearoff=0)
         config_menu.add_command(label="Configurar Atalhos", command=lambda: self.config_manager.edit_hotkeys(self.root))
         config_menu.add_command(label="Preferências", command=lambda: self.config_manager.save_preferences(self.root))
+        config_menu.add_command(label="Mostrar Tempos de Execução", command=self.toggle_profiling_overlay)
+        config_menu.add_separator()
+        config_menu.add_command(label="Abrir Projeto...", command=self.open_project)
+        config_menu.add_command(label="Salvar Projeto Como...", command=self.save_project_as)
         config_menu.tk_popup(self.config_btn.winfo_rootx(), self.config_btn.winfo_rooty() + self.config_btn.winfo_height())
 
+    def journal(self):
+        # O autosave pode ser ligado ou desligado nas preferências a qualquer momento
+        self.project.autosave = self.config.get('auto_save', False)
+        return self.project
+
+    def record_state(self, index=None):
+        index = self.current_image_index if index is None else index
+        self.journal().save_state(index, self.images[index])
+
+    def restore_session(self):
+        try:
+            self.project = ProjectJournal(DEFAULT_PROJECT_PATH, autosave=self.config.get('auto_save', False))
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            # Sem a sessão em disco o programa continua usável, com o diário só na memória
+            self.project = ProjectJournal(None, autosave=self.config.get('auto_save', False))
+            messagebox.showwarning("Aviso", f"Não foi possível abrir a sessão anterior; ela não será salva: {e}")
+            return
+        if self.project.images and messagebox.askyesno(
+            "Sessão Anterior",
+            f"Restaurar a sessão anterior com {len(self.project.images)} imagem(ns)?"
+        ):
+            self.load_project()
+        else:
+            self.journal().clear()
+
+    def open_project(self):
+        path = filedialog.askopenfilename(filetypes=[("Projeto de corte", "*.jsonl"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+
+        try:
+            self.project = ProjectJournal(path, autosave=self.config.get('auto_save', False))
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            messagebox.showerror("Erro", f"Não foi possível abrir o projeto: {e}")
+            return
+        self.load_project()
+
+    def save_project_as(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension='.jsonl', filetypes=[("Projeto de corte", "*.jsonl")]
+        )
+        if not path:
+            return
+
+        self.project.save_as(path)
+        self.update_status(f"Projeto salvo em {path}")
+
+    def load_project(self):
+        # O projeto guarda o tamanho de cada imagem, então reabrir não decodifica nenhum arquivo
+        missing = self.project.drop_missing()
+        if missing:
+            messagebox.showwarning(
+                "Aviso",
+                f"{len(missing)} imagem(ns) do projeto não foram encontradas e foram removidas:\n\n"
+                + "\n".join(os.path.basename(path) for path in missing[:20])
+            )
+
+        self.images = self.project.entries()
+        self.image_cache.clear()
+        self.preview_cache.clear()
+        self.ready_photos.clear()
+        self.tile_cache.clear()
+        self.sequence_start = self.project.sequence_start
+        self.current_image_index = min(self.project.current_index, max(len(self.images) - 1, 0))
+        self.active_slice_type = None
+        self.image_canvas.yview_moveto(0)
+        self.update_status(f"{len(self.images)} imagem(ns) restaurada(s) do projeto")
+        self.show_images()
+
     def clear_all_images(self):
         if not self.images:
             return
@@ -281,7 +709,16 @@ class ModernStyledImageSlicer:
         
         if confirm:
             self.images.clear()
-            self.original_images.clear()
+            self.journal().clear()
+            self.image_cache.clear()
+            self.preview_cache.clear()
+            self.prefetcher.schedule([])
+            self.ready_photos.clear()
+            self.tile_cache.clear()
+            self.thumbnails.clear()
+            self.filmstrip.delete('all')
+            self.filmstrip.config(scrollregion=(0, 0, 0, 0))
+            self.cache_label.config(text="")
             self.current_image_index = 0
             self.image_canvas.delete('all')
             self.image_label.config(text="Nenhuma imagem carregada")
@@ -291,6 +728,10 @@ class ModernStyledImageSlicer:
             self.prev_btn.config(state=tk.DISABLED)
             self.save_images_btn.config(state=tk.DISABLED)
             self.undo_vertical_btn.config(state=tk.DISABLED)
+            self.redo_vertical_btn.config(state=tk.DISABLED)
+            self.auto_cut_btn.config(state=tk.DISABLED)
+            self.auto_slice_btn.config(state=tk.DISABLED)
+            self.recut_btn.config(state=tk.DISABLED)
 
     def setup_hotkeys(self):
         for hotkey in self.config['hotkeys'].values():
@@ -306,7 +747,11 @@ class ModernStyledImageSlicer:
             'previous_image': self.previous_image,
             'clear_all_images': self.clear_all_images,
             'save_images': self.save_images_without_slicing,
-            'undo_vertical': self.undo_vertical_cut
+            'undo_vertical': self.undo_vertical_cut,
+            'redo_vertical': self.redo_vertical_cut,
+            'auto_cut': self.auto_cut_images,
+            'toggle_view_mode': self.toggle_view_mode,
+            'toggle_profiling': self.toggle_profiling_overlay
         }
 
         for action, hotkey in hotkeys.items():
@@ -314,23 +759,49 @@ class ModernStyledImageSlicer:
                 self.root.bind(hotkey, lambda event, func=hotkey_map[action]: func())
 
     def on_window_resize(self, event=None):
-        if self.images:
-            self.update_image_display()
+        # O <Configure> do root também dispara para cada widget filho
+        if not self.images or (event is not None and event.widget is not self.root):
+            return
+
+        canvas_size = (self.image_canvas.winfo_width(), self.image_canvas.winfo_height())
+        if canvas_size == self.canvas_size:
+            return
+        self.canvas_size = canvas_size
+
+        # Enquanto a janela é arrastada, um único redesenho rápido por ciclo ocioso;
+        # o LANCZOS só roda quando o tamanho para de mudar
+        if not self.fast_render_pending:
+            self.fast_render_pending = True
+            self.root.after_idle(self.render_while_resizing)
+
+        if self.resize_job is not None:
+            self.root.after_cancel(self.resize_job)
+        self.resize_job = self.root.after(200, self.finish_resize)
+
+    def render_while_resizing(self):
+        self.fast_render_pending = False
+        self.update_image_display(fast=True)
+
+    def finish_resize(self):
+        self.resize_job = None
+        self.update_image_display()
 
     def show_hover_line(self, event):
         if not self.images:
             return
 
         self.image_canvas.delete('hover_line')
+        x, y = self.image_canvas.canvasx(event.x), self.image_canvas.canvasy(event.y)
+        left, top, right, bottom = self.visible_area()
         
         if self.cut_mode == 'horizontal':
             self.image_canvas.create_line(
-                0, event.y, self.image_canvas.winfo_width(), event.y, 
+                left, y, right, y, 
                 fill='gray', dash=(3, 3), tags='hover_line'
             )
         else:
             self.image_canvas.create_line(
-                event.x, 0, event.x, self.image_canvas.winfo_height(), 
+                x, top, x, bottom, 
                 fill='gray', dash=(3, 3), tags='hover_line'
             )
 
@@ -361,76 +832,561 @@ class ModernStyledImageSlicer:
             return
             
         self.sequence_start = start_num
+        auto_cut = self.config.get('auto_cut_on_load', False)
+
+        def load(path):
+            # Roda fora da thread do Tk; com auto-corte, a detecção também acontece aqui
+            with timer.stage('cabeçalho'):
+                size = read_image_info(path)
+            if not auto_cut:
+                return size, []
+            image = decode_image(path)
+            with timer.stage('auto-corte'):
+                return size, detect_gutters(image)
+
+        self.add_images_btn.config(state=tk.DISABLED)
+        self.update_status(f"Carregando 0/{len(file_paths)}...")
+        batch = self.background_io.map(load, file_paths)
+        self.root.after(50, self.poll_loading, batch, start_num)
+
+    def poll_loading(self, batch, start_num):
+        if not batch.finished():
+            self.update_status(f"Carregando {batch.done}/{batch.total}...")
+            self.root.after(50, self.poll_loading, batch, start_num)
+            return
 
-        for i, path in enumerate(file_paths, start=self.sequence_start):
-            try:
-                image = Image.open(path)
-                ext = os.path.splitext(path)[1].lower()
-                new_filename = f"{i}{ext}"
-                
-                self.images.append({
-                    'path': path,
-                    'display_name': new_filename,
-                    'original_name': os.path.basename(path),
-                    'image': image,
-                    'horizontal_slices': [],
-                    'vertical_slices': [],
-                    'cropped_images': []
-                })
-            except Exception as e:
-                messagebox.showerror("Erro", f"Não foi possível carregar {path}: {str(e)}")
+        self.add_images_btn.config(state=tk.NORMAL)
+        timer.record('carregar lote', time.perf_counter() - batch.started)
+        sequence = {path: i for i, path in enumerate(batch.items, start=start_num)}
+        new_images = []
+        for path, (size, horizontal_slices) in batch.succeeded():
+            new_images.append({
+                'path': path,
+                'display_name': sequence_name(path, sequence[path]),
+                'original_name': os.path.basename(path),
+                'size': size,
+                'horizontal_slices': horizontal_slices,
+                'vertical_slices': [],
+                'crop_history': [],
+                'redo_history': [],
+                'cropped_images': []
+            })
+        self.images.extend(new_images)
+        self.journal().add_images(new_images, start_num)
+
+        loaded = batch.total - len(batch.errors)
+        self.update_status(f"{loaded} imagem(ns) carregada(s)")
+        if batch.errors:
+            messagebox.showerror(
+                "Erro",
+                f"Não foi possível carregar {len(batch.errors)} arquivo(s):\n\n{format_error_report(batch.errors)}"
+            )
 
         if self.images:
             self.current_image_index = 0
+        self.show_images()
+
+    def show_images(self):
+        self.build_filmstrip()
+
+        if self.images:
             self.update_image_display()
+            self.update_undo_state()
             self.slice_images_btn.config(state=tk.NORMAL)
             self.clear_slices_btn.config(state=tk.NORMAL)
             self.save_images_btn.config(state=tk.NORMAL)
+            self.auto_cut_btn.config(state=tk.NORMAL)
+            self.auto_slice_btn.config(state=tk.NORMAL)
+            self.recut_btn.config(state=tk.NORMAL)
             
             if len(self.images) > 1:
                 self.next_btn.config(state=tk.NORMAL)
                 self.prev_btn.config(state=tk.NORMAL)
 
-    def update_image_display(self):
+    def auto_cut_images(self, images=None):
         if not self.images:
             return
 
+        # Só sugere cortes para imagens que ainda não têm cortes horizontais
+        targets = [image for image in (images if images is not None else self.images)
+                   if not image['horizontal_slices']]
+        positions = {id(image): index for index, image in enumerate(self.images)}
+        suggested = 0
+        unreadable = 0
+        for current_image in targets:
+            try:
+                image = self.get_image(current_image)
+            except OSError:
+                unreadable += 1
+                continue
+            current_image['horizontal_slices'].extend(detect_gutters(image))
+            suggested += len(current_image['horizontal_slices']) // 2
+            self.record_state(positions[id(current_image)])
+
+        message = f"Auto-corte: {suggested} painéis sugeridos em {len(targets) - unreadable} imagem(ns)"
+        if unreadable:
+            message += f", {unreadable} não puderam ser lidas"
+        self.update_status(message)
+        self.draw_slice_lines()
+
+    def auto_slice_dialog(self):
+        if not self.images:
+            return
+
+        settings = {'scope': 'image', 'mode': 'height', 'height': 2000, 'kb': 800, 'snap_rows': 150,
+                    **self.config.get('auto_slice', {})}
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Fatiar por Tamanho")
+        dialog.geometry("340x330")
+
+        scope_var = tk.StringVar(value=settings['scope'])
+        mode_var = tk.StringVar(value=settings['mode'])
+        height_var = tk.IntVar(value=settings['height'])
+        kb_var = tk.IntVar(value=settings['kb'])
+        snap_var = tk.IntVar(value=settings['snap_rows'])
+
+        ttk.Label(dialog, text="Aplicar em").pack(pady=(10, 0))
+        ttk.Radiobutton(dialog, text="Cada imagem (vira cortes horizontais)", variable=scope_var, value='image').pack()
+        ttk.Radiobutton(dialog, text="Capítulo inteiro (exporta a tira contínua)", variable=scope_var, value='chapter').pack()
+
+        limits_frame = ttk.Frame(dialog)
+        limits_frame.pack(pady=10)
+        ttk.Radiobutton(limits_frame, text="Altura máxima (pixels)", variable=mode_var, value='height').grid(row=0, column=0, sticky='w')
+        ttk.Spinbox(limits_frame, from_=100, to=100000, textvariable=height_var, width=8).grid(row=0, column=1, padx=5)
+        ttk.Radiobutton(limits_frame, text="Tamanho máximo (KB)", variable=mode_var, value='bytes').grid(row=1, column=0, sticky='w')
+        ttk.Spinbox(limits_frame, from_=10, to=100000, textvariable=kb_var, width=8).grid(row=1, column=1, padx=5)
+
+        ttk.Label(dialog, text="Recuo máximo até uma faixa lisa (linhas, 0 = exato)").pack()
+        ttk.Spinbox(dialog, from_=0, to=2000, textvariable=snap_var, width=8).pack(pady=5)
+
+        def apply():
+            settings = {
+                'scope': scope_var.get(),
+                'mode': mode_var.get(),
+                'height': height_var.get(),
+                'kb': kb_var.get(),
+                'snap_rows': snap_var.get()
+            }
+            if self.auto_slice_limit(settings) <= 0:
+                messagebox.showwarning("Aviso", "O limite de cada pedaço precisa ser maior que zero")
+                return
+            self.config['auto_slice'] = settings
+            dialog.destroy()
+            if settings['scope'] == 'image':
+                self.auto_slice_images(settings)
+            else:
+                self.auto_slice_chapter(settings)
+
+        ttk.Button(dialog, text="Fatiar", command=apply).pack(pady=15)
+
+    def auto_slice_limit(self, settings):
+        if settings['mode'] == 'height':
+            return settings['height']
+        return settings['kb'] * 1024
+
+    def auto_slice_images(self, settings):
+        targets = list(self.images)
+        profile = self.config_manager.export_profile()
+        limit = self.auto_slice_limit(settings)
+
+        def plan(index):
+            # Roda fora da thread do Tk; a imagem é decodificada sem passar pelo cache da exibição
+            current_image = targets[index]
+            ext = output_ext(os.path.splitext(current_image['display_name'])[1], profile)
+            image = decode_image(current_image['path'], self.crop_box(current_image))
+            return auto_slices(image, settings['mode'], limit, profile, ext, settings['snap_rows'])
+
+        self.auto_slice_btn.config(state=tk.DISABLED)
+        self.update_status(f"Planejando cortes 0/{len(targets)}...")
+        batch = self.background_io.map(plan, range(len(targets)))
+        self.root.after(50, self.poll_auto_slice, batch, targets)
+
+    def poll_auto_slice(self, batch, targets):
+        if not batch.finished():
+            self.update_status(f"Planejando cortes {batch.done}/{batch.total}...")
+            self.root.after(50, self.poll_auto_slice, batch, targets)
+            return
+
+        self.auto_slice_btn.config(state=tk.NORMAL)
+        positions = {id(image): index for index, image in enumerate(self.images)}
+        pieces = 0
+        for index, horizontal_slices in batch.succeeded():
+            current_image = targets[index]
+            # A lista de imagens pode ter sido limpa enquanto o planejamento rodava
+            if id(current_image) not in positions:
+                continue
+            current_image['horizontal_slices'][:] = horizontal_slices
+            pieces += len(horizontal_slices) // 2
+            self.record_state(positions[id(current_image)])
+
+        self.update_status(f"{pieces} pedaços planejados em {batch.total - len(batch.errors)} imagem(ns)")
+        if batch.errors:
+            messagebox.showerror(
+                "Erro",
+                f"Não foi possível planejar {len(batch.errors)} imagem(ns):\n\n"
+                + format_error_report([(targets[index]['path'], error) for index, error in batch.errors])
+            )
+        self.active_slice_type = None
+        self.draw_slice_lines()
+
+    def auto_slice_chapter(self, settings):
+        output_folder = filedialog.askdirectory(title="Selecione a pasta para salvar as imagens")
+        if not output_folder:
+            return
+
+        pages = [(image['path'], self.crop_box(image), self.image_size(image)) for image in self.images]
+        strip = VirtualStrip(pages)
+        ext = os.path.splitext(self.images[0]['display_name'])[1]
+        profile = self.config_manager.export_profile()
+        limit = self.auto_slice_limit(settings)
+
+        def task(on_progress, cancel_event):
+            # O planejamento decodifica cada página uma vez; a exportação volta a ler página por página
+            segments = plan_strip(strip, settings['mode'], limit, profile, output_ext(ext, profile), settings['snap_rows'])
+            return run_recut(strip, segments, output_folder, ext, self.sequence_start, on_progress, cancel_event, profile)
+
+        self.start_background(
+            task,
+            len(pages),
+            lambda stats: self.finish_export(stats, f"Capítulo fatiado em {stats['images']} pedaços em {output_folder}")
+        )
+
+    def display_size(self, current_image):
+        canvas_width = self.image_canvas.winfo_width()
+        canvas_height = self.image_canvas.winfo_height()
+        img_width, img_height = self.image_size(current_image)
+        scale = min(canvas_width / img_width, canvas_height / img_height)
+        return max(int(img_width * scale), 1), max(int(img_height * scale), 1)
+
+    def preview_key(self, current_image, size):
+        return (current_image['path'], self.crop_box(current_image), size)
+
+    def update_image_display(self, fast=False):
+        if not self.images:
+            return
+
+        if self.view_mode == 'scroll':
+            self.update_scroll_display()
+            return
+
         current_image = self.images[self.current_image_index]
-        image = current_image['image']
         
         canvas_width = self.image_canvas.winfo_width()
         canvas_height = self.image_canvas.winfo_height()
-        img_width, img_height = image.size
-        scale = min(canvas_width / img_width, canvas_height / img_height)
-        new_width = int(img_width * scale)
-        new_height = int(img_height * scale)
+        size = self.display_size(current_image)
+        key = self.preview_key(current_image, size)
         
-        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(resized_image)
-        self.image_canvas.delete('all')
-        self.image_canvas.create_image(canvas_width // 2, canvas_height // 2, image=self.tk_image, anchor=tk.CENTER)
+        frame_started = time.perf_counter()
+        unreadable = False
+        if key in self.ready_photos:
+            self.tk_image = self.ready_photos[key]
+        else:
+            resample = Image.Resampling.BILINEAR if fast else Image.Resampling.LANCZOS
+            try:
+                with timer.stage('redimensionar'):
+                    resized_image = self.preview_cache.render(
+                        current_image['path'], self.crop_box(current_image), size, resample
+                    )
+            except OSError as e:
+                # Os pixels só são lidos do disco agora; o arquivo pode ter sumido depois de carregado
+                resized_image = self.placeholder_image(size)
+                unreadable = True
+                self.report_unreadable(current_image, e)
+            with timer.stage('photoimage'):
+                self.tk_image = ImageTk.PhotoImage(resized_image)
+            if not fast and not unreadable:
+                self.ready_photos[key] = self.tk_image
+        self.cache_label.config(text=self.image_cache.stats_text())
+        with timer.stage('canvas'):
+            self.image_canvas.delete('all')
+            self.image_canvas.create_image(canvas_width // 2, canvas_height // 2, image=self.tk_image, anchor=tk.CENTER)
+            if unreadable:
+                self.image_canvas.create_text(canvas_width // 2, canvas_height // 2, text="Imagem indisponível",
+                                              fill='#e0e0e0', font=('Segoe UI', 14, 'bold'))
         
         self.image_label.config(text=f"{current_image['display_name']} ({self.current_image_index + 1}/{len(self.images)})")
+        self.highlight_thumbnail()
+        self.draw_slice_lines()
+        timer.record('quadro', time.perf_counter() - frame_started)
+
+        if not fast:
+            self.schedule_prefetch()
+        self.draw_profiling_overlay()
+
+    def placeholder_image(self, size):
+        return Image.new('RGB', size, (64, 64, 64))
+
+    def report_unreadable(self, current_image, error):
+        self.update_status(f"Não foi possível ler {current_image['display_name']}: {error}")
+
+    def view_geometry(self, current_image):
+        # Escala e deslocamento da imagem em coordenadas do canvas (não da janela)
+        canvas_width = self.image_canvas.winfo_width()
+        canvas_height = self.image_canvas.winfo_height()
+        img_width, img_height = self.image_size(current_image)
+
+        if self.view_mode == 'scroll':
+            scale = canvas_width / img_width * self.zoom_factor
+            return scale, max((canvas_width - img_width * scale) / 2, 0), 0
+
+        scale = min(canvas_width / img_width, canvas_height / img_height)
+        return scale, (canvas_width - img_width * scale) / 2, (canvas_height - img_height * scale) / 2
+
+    def visible_area(self):
+        left = self.image_canvas.canvasx(0)
+        top = self.image_canvas.canvasy(0)
+        return left, top, left + self.image_canvas.winfo_width(), top + self.image_canvas.winfo_height()
+
+    def toggle_view_mode(self):
+        if self.view_mode == 'fit':
+            self.view_mode = 'scroll'
+            self.view_mode_btn.config(text="🖼️ Modo Ajustado")
+            self.v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, before=self.image_canvas)
+            self.h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X, before=self.image_canvas)
+        else:
+            self.view_mode = 'fit'
+            self.view_mode_btn.config(text="🔍 Modo Rolagem")
+            self.v_scrollbar.pack_forget()
+            self.h_scrollbar.pack_forget()
+            self.image_canvas.config(scrollregion=(0, 0, 0, 0))
+            self.image_canvas.xview_moveto(0)
+            self.image_canvas.yview_moveto(0)
+        self.zoom_factor = 1.0
+        self.update_image_display()
+
+    def change_zoom(self, factor):
+        if self.view_mode != 'scroll' or not self.images:
+            return
+
+        # Mantém o centro da área visível no mesmo ponto da imagem
+        current_image = self.images[self.current_image_index]
+        left, top, right, bottom = self.visible_area()
+        scale, x_offset, _ = self.view_geometry(current_image)
+        center_x = ((left + right) / 2 - x_offset) / scale
+        center_y = (top + bottom) / 2 / scale
+
+        self.zoom_factor = min(max(self.zoom_factor * factor, 0.1), 16.0)
+        self.update_scroll_display()
+
+        scale, x_offset, _ = self.view_geometry(current_image)
+        region_width, region_height = self.scroll_region_size(current_image)
+        self.image_canvas.xview_moveto(max(center_x * scale + x_offset - self.image_canvas.winfo_width() / 2, 0) / region_width)
+        self.image_canvas.yview_moveto(max(center_y * scale - self.image_canvas.winfo_height() / 2, 0) / region_height)
+
+    def on_mouse_wheel(self, direction):
+        if self.view_mode == 'scroll':
+            self.image_canvas.yview_scroll(direction * 3, 'units')
+
+    def on_canvas_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if self.view_mode == 'scroll' and not self.tile_render_pending:
+            self.tile_render_pending = True
+            self.root.after_idle(self.render_visible_tiles)
+
+    def scroll_region_size(self, current_image):
+        scale, _, _ = self.view_geometry(current_image)
+        img_width, img_height = self.image_size(current_image)
+        return max(img_width * scale, self.image_canvas.winfo_width()), img_height * scale
+
+    def update_scroll_display(self):
+        current_image = self.images[self.current_image_index]
+        region_width, region_height = self.scroll_region_size(current_image)
+
+        self.image_canvas.delete('all')
+        self.image_canvas.config(scrollregion=(0, 0, region_width, region_height))
+        self.image_label.config(text=f"{current_image['display_name']} ({self.current_image_index + 1}/{len(self.images)})")
+        self.highlight_thumbnail()
+        self.render_visible_tiles()
         self.draw_slice_lines()
 
+    def render_visible_tiles(self):
+        self.tile_render_pending = False
+        if self.view_mode != 'scroll' or not self.images:
+            return
+
+        # Só os blocos que cruzam a área visível são reamostrados; o resto da tira não custa nada
+        current_image = self.images[self.current_image_index]
+        scale, x_offset, _ = self.view_geometry(current_image)
+        img_width, img_height = self.image_size(current_image)
+        display_width, display_height = int(img_width * scale), int(img_height * scale)
+        left, top, right, bottom = self.visible_area()
+        crop_box = self.crop_box(current_image)
+
+        self.image_canvas.delete('tile')
+        # Blocos de substituição não entram no cache, para que o arquivo volte a ser lido quando existir
+        self.placeholder_tiles = []
+        first_col = max(int((left - x_offset) // TILE_SIZE), 0)
+        last_col = min(int((right - x_offset) // TILE_SIZE), (display_width - 1) // TILE_SIZE)
+        first_row = max(int(top // TILE_SIZE), 0)
+        last_row = min(int(bottom // TILE_SIZE), (display_height - 1) // TILE_SIZE)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                x0, y0 = col * TILE_SIZE, row * TILE_SIZE
+                x1, y1 = min(x0 + TILE_SIZE, display_width), min(y0 + TILE_SIZE, display_height)
+                key = (current_image['path'], crop_box, scale, col, row)
+
+                def render_tile(x0=x0, y0=y0, x1=x1, y1=y1):
+                    box = (x0 / scale, y0 / scale, x1 / scale, y1 / scale)
+                    with timer.stage('bloco'):
+                        return ImageTk.PhotoImage(self.preview_cache.render_region(
+                            current_image['path'], crop_box, (img_width, img_height), box, (x1 - x0, y1 - y0)
+                        ))
+
+                try:
+                    photo = self.tile_cache.get(key, render_tile)
+                except OSError as e:
+                    photo = ImageTk.PhotoImage(self.placeholder_image((x1 - x0, y1 - y0)))
+                    self.placeholder_tiles.append(photo)
+                    self.report_unreadable(current_image, e)
+                self.image_canvas.create_image(x0 + x_offset, y0, image=photo, anchor=tk.NW, tags='tile')
+
+        self.image_canvas.tag_lower('tile')
+        self.cache_label.config(text=self.image_cache.stats_text())
+        self.draw_profiling_overlay()
+
+    def prefetch_indices(self):
+        count = len(self.images)
+        pages = min(self.config.get('prefetch_pages', 2), count - 1)
+        # Primeiro as páginas na direção em que o usuário está navegando
+        ahead = [(self.current_image_index + self.nav_direction * step) % count for step in range(1, pages + 1)]
+        behind = [(self.current_image_index - self.nav_direction * step) % count for step in range(1, pages + 1)]
+        return ahead + [index for index in behind if index not in ahead]
+
+    def schedule_prefetch(self):
+        wanted = {self.preview_key(self.images[self.current_image_index], self.display_size(self.images[self.current_image_index]))}
+        requests = []
+        for index in self.prefetch_indices():
+            current_image = self.images[index]
+            size = self.display_size(current_image)
+            key = self.preview_key(current_image, size)
+            wanted.add(key)
+            if key not in self.ready_photos:
+                requests.append((key, current_image['path'], self.crop_box(current_image), size))
+
+        # Descarta as páginas que saíram da janela de pré-carregamento
+        for key in list(self.ready_photos):
+            if key not in wanted:
+                del self.ready_photos[key]
+        self.prefetch_wanted = wanted
+        self.prefetcher.schedule(requests)
+
+    def poll_prefetch(self):
+        # PhotoImage só pode ser criado na thread do Tk; a thread de fundo entrega a imagem já reduzida
+        while True:
+            try:
+                key, image = self.prefetcher.results.get_nowait()
+            except queue.Empty:
+                break
+            if key in self.prefetch_wanted:
+                with timer.stage('photoimage'):
+                    self.ready_photos[key] = ImageTk.PhotoImage(image)
+        self.root.after(50, self.poll_prefetch)
+
+    def toggle_profiling_overlay(self):
+        self.profiling_overlay = not self.profiling_overlay
+        self.draw_profiling_overlay()
+
+    def draw_profiling_overlay(self):
+        self.image_canvas.delete('profiling')
+        if not self.profiling_overlay:
+            return
+
+        # Preso ao canto visível, também no modo de rolagem
+        x, y = self.image_canvas.canvasx(10), self.image_canvas.canvasy(10)
+        text = self.image_canvas.create_text(
+            x + 6, y + 6, text=timer.overlay_text(), fill='#00FF00', font=('Courier', 9), anchor=tk.NW, tags='profiling'
+        )
+        left, top, right, bottom = self.image_canvas.bbox(text)
+        background = self.image_canvas.create_rectangle(
+            left - 6, top - 6, right + 6, bottom + 6, fill='black', outline='', tags='profiling'
+        )
+        self.image_canvas.tag_lower(background, text)
+
+    def poll_profiling_overlay(self):
+        # As threads de fundo também registram tempos; o painel é atualizado mesmo sem redesenhar a imagem
+        if self.profiling_overlay:
+            self.draw_profiling_overlay()
+        self.root.after(500, self.poll_profiling_overlay)
+
+    def thumbnail_slot(self, index):
+        # Cada miniatura ocupa uma caixa fixa; as que ainda não chegaram aparecem como um retângulo vazio
+        x0 = 5 + index * (THUMBNAIL_SIZE[0] + 10)
+        return x0, 5, x0 + THUMBNAIL_SIZE[0], 5 + THUMBNAIL_SIZE[1]
+
+    def build_filmstrip(self):
+        self.filmstrip.delete('all')
+        for index, current_image in enumerate(self.images):
+            x0, y0, x1, y1 = self.thumbnail_slot(index)
+            self.filmstrip.create_rectangle(x0, y0, x1, y1, outline='#555555', fill='#3C3C3C', tags=f"slot_{index}")
+            path = current_image['path']
+            if path in self.thumbnails:
+                self.draw_thumbnail(index, self.thumbnails[path])
+            else:
+                self.thumbnail_worker.request(path, path)
+
+        width = self.thumbnail_slot(len(self.images))[0]
+        self.filmstrip.config(scrollregion=(0, 0, width, THUMBNAIL_SIZE[1] + 10))
+        self.highlight_thumbnail()
+
+    def draw_thumbnail(self, index, photo):
+        x0, y0, x1, y1 = self.thumbnail_slot(index)
+        self.filmstrip.create_image((x0 + x1) // 2, (y0 + y1) // 2, image=photo, anchor=tk.CENTER)
+
+    def highlight_thumbnail(self):
+        self.filmstrip.delete('current_page')
+        if not self.images:
+            return
+
+        x0, y0, x1, y1 = self.thumbnail_slot(self.current_image_index)
+        self.filmstrip.create_rectangle(x0 - 3, y0 - 3, x1 + 3, y1 + 3, outline='#4CAF50', width=3, tags='current_page')
+
+        # Mantém a página atual visível quando a navegação é feita pelas setas
+        first, last = self.filmstrip.xview()
+        total = self.thumbnail_slot(len(self.images))[0]
+        if x0 < first * total or x1 > last * total:
+            self.filmstrip.xview_moveto(max(x0 - 5, 0) / total)
+
+    def poll_thumbnails(self):
+        while True:
+            try:
+                path, image = self.thumbnail_worker.results.get_nowait()
+            except queue.Empty:
+                break
+            photo = ImageTk.PhotoImage(image)
+            self.thumbnails[path] = photo
+            for index, current_image in enumerate(self.images):
+                if current_image['path'] == path:
+                    self.draw_thumbnail(index, photo)
+        self.filmstrip.tag_raise('current_page')
+        self.root.after(100, self.poll_thumbnails)
+
+    def on_filmstrip_click(self, event):
+        index = int(self.filmstrip.canvasx(event.x) - 5) // (THUMBNAIL_SIZE[0] + 10)
+        if not 0 <= index < len(self.images) or index == self.current_image_index:
+            return
+
+        self.nav_direction = 1 if index > self.current_image_index else -1
+        self.current_image_index = index
+        self.journal().set_current(index)
+        self.image_canvas.yview_moveto(0)
+        self.update_image_display()
+        self.update_undo_state()
+
     def add_slice_line(self, event):
         if not self.images:
             return
 
         current_image = self.images[self.current_image_index]
-        canvas_width = self.image_canvas.winfo_width()
-        canvas_height = self.image_canvas.winfo_height()
-        img_width, img_height = current_image['image'].size
-        scale = min(canvas_width / img_width, canvas_height / img_height)
-        x_offset = (canvas_width - img_width * scale) / 2
-        y_offset = (canvas_height - img_height * scale) / 2
+        img_width, img_height = self.image_size(current_image)
+        scale, x_offset, y_offset = self.view_geometry(current_image)
 
         if self.cut_mode == 'horizontal':
-            y_relative = (event.y - y_offset) / scale
+            y_relative = (self.image_canvas.canvasy(event.y) - y_offset) / scale
             percent = (y_relative / img_height) * 100
             slices = current_image['horizontal_slices']
         else:
-            x_relative = (event.x - x_offset) / scale
+            x_relative = (self.image_canvas.canvasx(event.x) - x_offset) / scale
             percent = (x_relative / img_width) * 100
             slices = current_image['vertical_slices']
 
@@ -446,13 +1402,12 @@ class ModernStyledImageSlicer:
 
         slices.append(percent)
         slices.sort()
+        self.record_state()
         self.draw_slice_lines()
 
         if self.cut_mode == 'vertical' and len(current_image['vertical_slices']) == 2:
-            if self.current_image_index not in self.original_images:
-                self.original_images[self.current_image_index] = copy.deepcopy(current_image['image'])
             self.auto_vertical_crop()
-            self.undo_vertical_btn.config(state=tk.NORMAL)
+            self.update_undo_state()
 
     def auto_vertical_crop(self):
         if not self.images:
@@ -464,17 +1419,14 @@ class ModernStyledImageSlicer:
         if len(vertical_slices) != 2:
             return
 
-        image = current_image['image']
-        img_width, img_height = image.size
-
-        start_v_percent, end_v_percent = vertical_slices
-        start_v_pixel = int((start_v_percent / 100) * img_width)
-        end_v_pixel = int((end_v_percent / 100) * img_width)
-
-        cropped_vertical = image.crop((start_v_pixel, 0, end_v_pixel, img_height))
-        current_image['image'] = cropped_vertical
+        # O recorte é aplicado sob demanda a partir do arquivo original
+        current_image['crop_history'].append(
+            compose_crop(self.crop_box(current_image), current_image['size'], vertical_slices)
+        )
+        current_image['redo_history'].clear()
         current_image['vertical_slices'].clear()
         self.active_slice_type = None
+        self.record_state()
         self.update_image_display()
 
     def draw_slice_lines(self):
@@ -482,37 +1434,31 @@ class ModernStyledImageSlicer:
             return
 
         current_image = self.images[self.current_image_index]
-        canvas_width = self.image_canvas.winfo_width()
-        canvas_height = self.image_canvas.winfo_height()
-        img_width, img_height = current_image['image'].size
-        scale = min(canvas_width / img_width, canvas_height / img_height)
-        x_offset = (canvas_width - img_width * scale) / 2
-        y_offset = (canvas_height - img_height * scale) / 2
+        img_width, img_height = self.image_size(current_image)
+        scale, x_offset, y_offset = self.view_geometry(current_image)
+        line_width = max(self.image_canvas.winfo_width(), img_width * scale)
+        line_height = max(self.image_canvas.winfo_height(), img_height * scale)
 
+        started = time.perf_counter()
         self.image_canvas.delete('slice_line')
         
         for i, percent in enumerate(current_image['horizontal_slices'], 1):
             y = ((percent / 100) * img_height * scale) + y_offset
-            self.image_canvas.create_line(0, y, canvas_width, y, fill='red', width=2, tags='slice_line')
+            self.image_canvas.create_line(0, y, line_width, y, fill='red', width=2, tags='slice_line')
             self.image_canvas.create_text(10, y - 10, text=f'H{i}', fill='red', anchor=tk.NW, tags='slice_line')
         
         for i, percent in enumerate(current_image['vertical_slices'], 1):
             x = ((percent / 100) * img_width * scale) + x_offset
-            self.image_canvas.create_line(x, 0, x, canvas_height, fill='blue', width=2, tags='slice_line')
+            self.image_canvas.create_line(x, 0, x, line_height, fill='blue', width=2, tags='slice_line')
             self.image_canvas.create_text(x + 10, 10, text=f'V{i}', fill='blue', anchor=tk.NW, tags='slice_line')
+        timer.record('linhas de corte', time.perf_counter() - started)
 
     def slice_images(self):
         if not self.images:
             messagebox.showwarning("Aviso", "Nenhuma imagem carregada")
             return
 
-        horizontal_slices_valid = False
-        for image in self.images:
-            if image['horizontal_slices'] and len(image['horizontal_slices']) % 2 == 0:
-                horizontal_slices_valid = True
-                break
-
-        if not horizontal_slices_valid:
+        if not any(has_valid_slices(image['horizontal_slices']) for image in self.images):
             messagebox.showwarning("Aviso", "Adicione cortes horizontais em pares para todas as imagens")
             return
 
@@ -520,33 +1466,26 @@ class ModernStyledImageSlicer:
         if not output_folder:
             return
 
-        for img_index, current_image in enumerate(self.images):
-            horizontal_slices = current_image['horizontal_slices']
-            
-            if not horizontal_slices or len(horizontal_slices) % 2 != 0:
-                continue
+        with timer.stage('preparar'):
+            jobs = [
+                self.export_job_for(current_image, current_image['horizontal_slices'])
+                for current_image in self.images
+                if has_valid_slices(current_image['horizontal_slices'])
+            ]
+        self.start_export(jobs, output_folder, lambda stats: self.finish_slicing(stats, output_folder))
+
+    def finish_slicing(self, stats, output_folder):
+        if not self.finish_export(stats, f"Imagens cortadas salvas em {output_folder}"):
+            return
+
+        # Na exportação incremental os cortes ficam, para que uma correção regrave só o que mudou
+        if not self.config.get('incremental_export', False):
+            for index, image in enumerate(self.images):
+                image['horizontal_slices'].clear()
+                self.record_state(index)
 
-            image = current_image['image']
-            img_width, img_height = image.size
-            
-            for slice_index in range(0, len(horizontal_slices), 2):
-                start_percent = horizontal_slices[slice_index]
-                end_percent = horizontal_slices[slice_index + 1]
-                start_pixel = int((start_percent / 100) * img_height)
-                end_pixel = int((end_percent / 100) * img_height)
-                cropped_horizontal = image.crop((0, start_pixel, img_width, end_pixel))
-                
-                base_name = os.path.splitext(current_image['display_name'])[0]
-                ext = os.path.splitext(current_image['display_name'])[1]
-                output_filename = f"{base_name}_corte_{slice_index//2 + 1}{ext}"
-                output_path = os.path.join(output_folder, output_filename)
-                cropped_horizontal.save(output_path)
-
-        for image in self.images:
-            image['horizontal_slices'].clear()
-
-        messagebox.showinfo("Sucesso", f"Imagens cortadas salvas em {output_folder}")
         self.active_slice_type = None
+        self.draw_slice_lines()
 
     def clear_slices(self):
         if not self.images:
@@ -556,28 +1495,49 @@ class ModernStyledImageSlicer:
         current_image['horizontal_slices'].clear()
         current_image['vertical_slices'].clear()
         self.active_slice_type = None
+        self.record_state()
         self.draw_slice_lines()
 
     def next_image(self):
         if not self.images:
             return
 
+        self.nav_direction = 1
         self.current_image_index = (self.current_image_index + 1) % len(self.images)
+        self.journal().set_current(self.current_image_index)
+        self.image_canvas.yview_moveto(0)
         self.update_image_display()
-        self.undo_vertical_btn.config(state=tk.NORMAL if self.current_image_index in self.original_images else tk.DISABLED)
+        self.update_undo_state()
 
     def previous_image(self):
         if not self.images:
             return
 
+        self.nav_direction = -1
         self.current_image_index = (self.current_image_index - 1) % len(self.images)
+        self.journal().set_current(self.current_image_index)
+        self.image_canvas.yview_moveto(0)
         self.update_image_display()
-        self.undo_vertical_btn.config(state=tk.NORMAL if self.current_image_index in self.original_images else tk.DISABLED)
+        self.update_undo_state()
 
 def main():
+    parser = argparse.ArgumentParser(description="Lility Imagem Pro")
+    parser.add_argument('--profile', help="Grava um perfil cProfile da sessão neste arquivo ao fechar")
+    parser.add_argument('--timings', help="Grava os tempos por etapa da sessão em JSON ao fechar")
+    args = parser.parse_args()
+
+    profiler = SessionProfiler(args.profile) if args.profile else None
+    if profiler:
+        profiler.start()
+
     root = tk.Tk()
     app = ModernStyledImageSlicer(root)
     root.mainloop()
 
+    if profiler:
+        profiler.stop()
+    if args.timings:
+        timer.dump(args.timings)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from slicer_engine import (
+    detect_gutters, slice_image, slice_output_name, sequence_name, save_image, output_filename,
+    add_profile_arguments, profile_from_args
+)
+from image_cache import ImageCache, PreviewCache, read_image_info
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def synthetic_page(rng, width, height, gutter=120):
+    # Painéis de ruído separados por calhas brancas, como uma tira de webtoon
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    y = int(rng.integers(20, gutter))
+    while y < height - gutter:
+        panel_height = min(int(rng.integers(height // 8, height // 3)), height - gutter - y)
+        base = rng.integers(0, 256, 3, dtype=np.uint8)
+        noise = rng.integers(0, 64, (panel_height, width, 1), dtype=np.uint8)
+        page[y:y + panel_height] = base // 2 + noise
+        y += panel_height + int(rng.integers(gutter // 2, gutter * 2))
+    return Image.fromarray(page)
+
+
+def build_chapter(folder, pages, width, height, ext, seed):
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for number in range(1, pages + 1):
+        path = os.path.join(folder, f"{number:04d}{ext}")
+        synthetic_page(rng, width, height).save(path)
+        paths.append(path)
+    return paths
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def summarize(latencies):
+    samples = np.array(latencies) * 1000
+    total = float(np.sum(samples)) / 1000
+    return {
+        'count': len(latencies),
+        'total_s': round(total, 4),
+        'throughput_per_s': round(len(latencies) / total, 2) if total else None,
+        'p50_ms': round(float(np.percentile(samples, 50)), 3),
+        'p90_ms': round(float(np.percentile(samples, 90)), 3),
+        'p99_ms': round(float(np.percentile(samples, 99)), 3),
+        'max_ms': round(float(np.max(samples)), 3),
+    }
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def bench_chapter(paths, output_folder, canvas_size, profile):
+    # As mesmas funções usadas por add_images, update_image_display e slice_images, sem o Tk
+    image_cache = ImageCache(2**40)
+    preview_cache = PreviewCache(2**40, image_cache)
+    latencies = {'load': [], 'decode': [], 'preview': [], 'detect': [], 'crop': [], 'save': []}
+    slices = 0
+    output_bytes = 0
+
+    for number, path in enumerate(paths, 1):
+        size, elapsed = timed(read_image_info, path)
+        latencies['load'].append(elapsed)
+
+        image, elapsed = timed(image_cache.get_image, path)
+        latencies['decode'].append(elapsed)
+
+        scale = min(canvas_size[0] / size[0], canvas_size[1] / size[1])
+        preview_size = (max(int(size[0] * scale), 1), max(int(size[1] * scale), 1))
+        _, elapsed = timed(preview_cache.render, path, None, preview_size)
+        latencies['preview'].append(elapsed)
+
+        horizontal_slices, elapsed = timed(detect_gutters, image)
+        latencies['detect'].append(elapsed)
+
+        pieces, elapsed = timed(lambda: list(slice_image(image, horizontal_slices)))
+        latencies['crop'].append(elapsed)
+
+        display_name = sequence_name(path, number)
+        started = time.perf_counter()
+        # Mesmo caminho de gravação da exportação, com o perfil escolhido
+        for slice_number, piece in enumerate(pieces, 1):
+            output_name = output_filename(slice_output_name(display_name, slice_number), profile)
+            output_bytes += save_image(piece, os.path.join(output_folder, output_name), profile)['bytes']
+        latencies['save'].append(time.perf_counter() - started)
+        slices += len(pieces)
+
+        image_cache.clear()
+        preview_cache.clear()
+
+    return latencies, slices, output_bytes
+
+
+def run_benchmark(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix='slicer_bench_')
+    report = {
+        'config': {
+            'chapters': args.chapters, 'pages': args.pages, 'width': args.width,
+            'height': args.height, 'format': args.ext, 'seed': args.seed, 'canvas': args.canvas,
+        },
+        'chapters': [],
+    }
+    canvas_size = tuple(int(value) for value in args.canvas.lower().split('x'))
+    profile = profile_from_args(args)
+    report['config']['profile'] = profile
+    totals = {}
+    total_slices = 0
+    total_bytes = 0
+
+    try:
+        for chapter in range(args.chapters):
+            chapter_folder = os.path.join(workdir, f"capitulo_{chapter + 1}")
+            paths = build_chapter(
+                os.path.join(chapter_folder, 'entrada'), args.pages, args.width, args.height,
+                args.ext, args.seed + chapter
+            )
+            output_folder = os.path.join(chapter_folder, 'saida')
+            os.makedirs(output_folder, exist_ok=True)
+
+            latencies, slices, output_bytes = bench_chapter(paths, output_folder, canvas_size, profile)
+            total_slices += slices
+            total_bytes += output_bytes
+            report['chapters'].append({
+                'pages': len(paths),
+                'slices': slices,
+                'output_mb': round(output_bytes / 2**20, 3),
+                'stages': {stage: summarize(values) for stage, values in latencies.items()},
+            })
+            for stage, values in latencies.items():
+                totals.setdefault(stage, []).extend(values)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report['total'] = {stage: summarize(values) for stage, values in totals.items()}
+    report['total']['slices'] = total_slices
+    report['total']['output_mb'] = round(total_bytes / 2**20, 3)
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do cortador com capítulos sintéticos reprodutíveis")
+    parser.add_argument('--chapters', type=int, default=1, help="Número de capítulos sintéticos")
+    parser.add_argument('--pages', type=int, default=20, help="Páginas por capítulo")
+    parser.add_argument('--width', type=int, default=800, help="Largura das páginas")
+    parser.add_argument('--height', type=int, default=6000, help="Altura das páginas")
+    parser.add_argument('--ext', default='.png', choices=['.png', '.jpg', '.webp'], help="Formato das páginas")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do gerador (mesma semente, mesmo capítulo)")
+    parser.add_argument('--canvas', default='1200x800', help="Tamanho do canvas simulado na pré-visualização")
+    parser.add_argument('--workdir', help="Pasta de trabalho (padrão: temporária, apagada no fim)")
+    parser.add_argument('--keep', action='store_true', help="Não apagar a pasta temporária")
+    parser.add_argument('-o', '--output', help="Arquivo JSON do relatório (padrão: saída padrão)")
+    add_profile_arguments(parser, report=False)
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run_benchmark(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
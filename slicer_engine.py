@@ -0,0 +1,730 @@
+import argparse
+import bisect
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp')
+
+# 'original' mantém a extensão da imagem de origem; os outros convertem o formato
+EXPORT_FORMATS = {'original': None, 'jpeg': '.jpg', 'png': '.png', 'webp': '.webp'}
+
+DEFAULT_PROFILE = {
+    'format': 'original',
+    'quality': 95,          # JPEG e WebP com perdas
+    'progressive': False,   # JPEG
+    'optimize': False,      # JPEG e PNG
+    'compress_level': 6,    # PNG, 0 a 9
+    'palette_colors': 0,    # PNG: quantiza para N cores quando > 0
+    'lossless': False,      # WebP
+    'method': 4,            # WebP: 0 (rápido) a 6 (menor)
+}
+
+# Guardado na pasta de saída; registra de onde veio cada arquivo exportado
+EXPORT_MANIFEST = '.corte_manifest.json'
+
+
+def percent_to_pixel(percent, size):
+    return int((percent / 100) * size)
+
+
+def horizontal_regions(horizontal_slices, img_height):
+    # Os cortes horizontais são lidos em pares (início, fim) em porcentagem
+    regions = []
+    for slice_index in range(0, len(horizontal_slices) - 1, 2):
+        start_pixel = percent_to_pixel(horizontal_slices[slice_index], img_height)
+        end_pixel = percent_to_pixel(horizontal_slices[slice_index + 1], img_height)
+        regions.append((start_pixel, end_pixel))
+    return regions
+
+
+def vertical_crop_box(vertical_slices, img_width, img_height):
+    start_v_percent, end_v_percent = sorted(vertical_slices)
+    start_v_pixel = percent_to_pixel(start_v_percent, img_width)
+    end_v_pixel = percent_to_pixel(end_v_percent, img_width)
+    return (start_v_pixel, 0, end_v_pixel, img_height)
+
+
+def compose_crop(crop_box, size, vertical_slices):
+    # Converte um corte vertical feito na imagem já recortada em um retângulo sobre o original
+    left, top, right, bottom = crop_box or (0, 0, *size)
+    start_v_pixel, _, end_v_pixel, _ = vertical_crop_box(vertical_slices, right - left, bottom - top)
+    return (left + start_v_pixel, top, left + end_v_pixel, bottom)
+
+
+def crop_size(size, crop_box):
+    if crop_box is None:
+        return tuple(size)
+    return crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]
+
+
+def slice_output_name(display_name, slice_number):
+    base_name, ext = os.path.splitext(display_name)
+    return f"{base_name}_corte_{slice_number}{ext}"
+
+
+def make_profile(profile=None):
+    return {**DEFAULT_PROFILE, **(profile or {})}
+
+
+def output_filename(name, profile):
+    ext = EXPORT_FORMATS.get(profile['format'])
+    return name if ext is None else os.path.splitext(name)[0] + ext
+
+
+def output_ext(ext, profile):
+    return EXPORT_FORMATS.get(profile['format']) or ext
+
+
+def encode_image(image, ext, profile):
+    ext = ext.lower()
+    if ext in ('.jpg', '.jpeg'):
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        return image, {'format': 'JPEG', 'quality': profile['quality'],
+                       'progressive': profile['progressive'], 'optimize': profile['optimize']}
+    if ext == '.png':
+        if profile['palette_colors']:
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+            image = image.quantize(colors=profile['palette_colors'], method=method)
+        return image, {'format': 'PNG', 'compress_level': profile['compress_level'], 'optimize': profile['optimize']}
+    if ext == '.webp':
+        return image, {'format': 'WEBP', 'quality': profile['quality'],
+                       'lossless': profile['lossless'], 'method': profile['method']}
+    return image, {}
+
+
+def save_image(image, output_path, profile):
+    started = time.perf_counter()
+    image, options = encode_image(image, os.path.splitext(output_path)[1], profile)
+    image.save(output_path, **options)
+    return {
+        'path': output_path,
+        'bytes': os.path.getsize(output_path),
+        'encode_seconds': time.perf_counter() - started,
+    }
+
+
+def sequence_name(path, number):
+    ext = os.path.splitext(path)[1].lower()
+    return f"{number}{ext}"
+
+
+def has_valid_slices(horizontal_slices):
+    return bool(horizontal_slices) and len(horizontal_slices) % 2 == 0
+
+
+def slice_image(image, horizontal_slices):
+    img_width, img_height = image.size
+    for start_pixel, end_pixel in horizontal_regions(horizontal_slices, img_height):
+        yield image.crop((0, start_pixel, img_width, end_pixel))
+
+
+def row_variance(image, column_step=4):
+    # Amostrar colunas mantém a detecção rápida em tiras muito altas
+    gray = np.asarray(image.convert('L'))[:, ::column_step].astype(np.float32)
+    return gray.var(axis=1)
+
+
+def _runs(mask):
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_gutters(image, variance_threshold=12.0, min_gutter_rows=12, min_panel_rows=40, margin_rows=8):
+    img_height = image.size[1]
+    detail = row_variance(image) > variance_threshold
+    gutter_starts, gutter_ends = _runs(~detail)
+
+    # Faixas lisas curtas fazem parte do painel (céu, balões), não são calhas
+    short = (gutter_ends - gutter_starts) < min_gutter_rows
+    for start, end in zip(gutter_starts[short], gutter_ends[short]):
+        detail[start:end] = True
+
+    panel_starts, panel_ends = _runs(detail)
+    keep = (panel_ends - panel_starts) >= min_panel_rows
+    panel_starts = np.maximum(panel_starts[keep] - margin_rows, 0)
+    panel_ends = np.minimum(panel_ends[keep] + margin_rows, img_height)
+
+    horizontal_slices = []
+    for start, end in zip(panel_starts, panel_ends):
+        horizontal_slices.extend((start / img_height * 100, end / img_height * 100))
+    return horizontal_slices
+
+
+def snap_targets(variance, snap_rows):
+    # Para cada linha y, a linha mais lisa em [y - snap_rows, y]; no empate fica a mais próxima de y
+    padded = np.concatenate((np.full(snap_rows, np.inf, dtype=np.float32), variance))
+    windows = sliding_window_view(padded, snap_rows + 1)[:, ::-1]
+    return np.arange(len(variance)) - windows.argmin(axis=1)
+
+
+def plan_cuts(variance, row_costs, budget, snap_rows=150):
+    # Cada pedaço vai o mais longe que o orçamento permite e recua até a linha mais lisa da janela;
+    # o laço só roda uma vez por corte, o trabalho por linha fica todo no numpy
+    if budget <= 0:
+        raise ValueError("O limite de cada pedaço precisa ser maior que zero")
+    snapped = snap_targets(variance, snap_rows) if snap_rows else np.arange(len(variance))
+    cumulative = np.concatenate(([0.0], np.cumsum(row_costs, dtype=np.float64)))
+    img_height = len(variance)
+    cuts = []
+    start = 0
+    while cumulative[img_height] - cumulative[start] > budget:
+        end = int(np.searchsorted(cumulative, cumulative[start] + budget, side='right')) - 1
+        end = max(end, start + 1)
+        if end >= img_height:
+            # Uma única linha já passa do orçamento; o resto vira o último pedaço
+            break
+        cut = int(snapped[end])
+        # Um recuo que deixaria o pedaço vazio ou minúsculo é ignorado
+        if cut <= start + (end - start) // 2:
+            cut = end
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def cuts_to_slices(cuts, img_height):
+    bounds = [0, *cuts, img_height]
+    horizontal_slices = []
+    for start, end in zip(bounds, bounds[1:]):
+        horizontal_slices.extend((start / img_height * 100, end / img_height * 100))
+    return horizontal_slices
+
+
+def sample_rows(img_height, img_width, max_pixels=2**20, band_rows=32):
+    # Faixas em resolução original espalhadas pela imagem; reduzir a imagem suavizaria o ruído e subestimaria o tamanho
+    bands = max(1, min(img_height // band_rows, max_pixels // (img_width * band_rows)))
+    starts = np.linspace(0, img_height - min(band_rows, img_height), bands).astype(int)
+    return np.unique(np.concatenate([np.arange(start, min(start + band_rows, img_height)) for start in starts]))
+
+
+def row_costs(image, variance, mode, profile=None, ext='.png'):
+    if mode == 'height':
+        return np.ones(len(variance), dtype=np.float32)
+
+    # Linhas com mais detalhe custam mais bytes; a escala vem da codificação real de uma amostra de linhas
+    weights = 1 + np.log1p(variance)
+    rows = sample_rows(image.size[1], image.size[0])
+    sample = Image.fromarray(np.asarray(image)[rows])
+    sample, options = encode_image(sample, ext, make_profile(profile))
+    buffer = io.BytesIO()
+    sample.save(buffer, **(options or {'format': 'PNG'}))
+    return weights * (buffer.tell() / weights[rows].sum())
+
+
+def auto_slices(image, mode, limit, profile=None, ext='.png', snap_rows=150, margin=0.9):
+    # mode 'height': limit em pixels; mode 'bytes': limit em bytes do arquivo codificado
+    variance = row_variance(image)
+    budget = limit if mode == 'height' else limit * margin
+    cuts = plan_cuts(variance, row_costs(image, variance, mode, profile, ext), budget, snap_rows)
+    return cuts_to_slices(cuts, image.size[1])
+
+
+def plan_strip(strip, mode, limit, profile=None, ext='.png', snap_rows=150, margin=0.9):
+    variances = []
+    costs = []
+    for index in range(len(strip.pages)):
+        page = strip.load_page(index)
+        variance = row_variance(page)
+        variances.append(variance)
+        costs.append(row_costs(page, variance, mode, profile, ext))
+    budget = limit if mode == 'height' else limit * margin
+    cuts = plan_cuts(np.concatenate(variances), np.concatenate(costs), budget, snap_rows)
+    return strip.segments(cuts)
+
+
+def open_source(job):
+    image = Image.open(job['path'])
+    if job.get('crop_box'):
+        image = image.crop(tuple(job['crop_box']))
+    return image
+
+
+def export_job(job, output_folder):
+    image = open_source(job)
+    profile = job['profile']
+    skip = set(job.get('skip_outputs', ()))
+
+    # Sem cortes horizontais a imagem é salva inteira com o nome da sequência
+    if job['horizontal_slices'] is None:
+        output_name = output_filename(job['display_name'], profile)
+        if output_name in skip:
+            return []
+        return [save_image(image, os.path.join(output_folder, output_name), profile)]
+
+    saved = []
+    img_width, img_height = image.size
+    for slice_number, (start_pixel, end_pixel) in enumerate(horizontal_regions(job['horizontal_slices'], img_height), 1):
+        output_name = output_filename(slice_output_name(job['display_name'], slice_number), profile)
+        if output_name in skip:
+            continue
+        cropped = image.crop((0, start_pixel, img_width, end_pixel))
+        saved.append(save_image(cropped, os.path.join(output_folder, output_name), profile))
+    return saved
+
+
+def job_outputs(job):
+    # Nome e retângulo sobre o original de cada arquivo do job; só o cabeçalho da imagem é lido
+    with Image.open(job['path']) as image:
+        size = image.size
+    left, top, right, bottom = job.get('crop_box') or (0, 0, *size)
+    profile = job['profile']
+
+    if job['horizontal_slices'] is None:
+        return [(output_filename(job['display_name'], profile), (left, top, right, bottom))]
+    return [
+        (output_filename(slice_output_name(job['display_name'], slice_number), profile),
+         (left, top + start_pixel, right, top + end_pixel))
+        for slice_number, (start_pixel, end_pixel)
+        in enumerate(horizontal_regions(job['horizontal_slices'], bottom - top), 1)
+    ]
+
+
+def output_signature(path, box, profile, output_name):
+    # Caminho, data e tamanho do arquivo de origem identificam o conteúdo sem precisar decodificá-lo
+    stat = os.stat(path)
+    key = json.dumps([
+        os.path.abspath(path), stat.st_mtime_ns, stat.st_size, list(box),
+        profile, os.path.splitext(output_name)[1].lower()
+    ], sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def read_export_manifest(output_folder):
+    try:
+        with open(os.path.join(output_folder, EXPORT_MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f).get('outputs', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_export_manifest(output_folder, outputs):
+    path = os.path.join(output_folder, EXPORT_MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'version': 1, 'outputs': outputs}, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def export_kind(job):
+    # Imagem inteira e fatias são exportações diferentes; uma não torna a outra órfã
+    return 'whole' if job['horizontal_slices'] is None else 'slices'
+
+
+def plan_incremental(jobs, output_folder, previous, stats):
+    # Marca em cada job os arquivos cuja assinatura não mudou; jobs sem nada a gravar nem são executados
+    planned = {}
+    runnable = []
+    for job in jobs:
+        try:
+            outputs = job_outputs(job)
+        except OSError:
+            # O erro aparece de novo na exportação e entra no relatório normal
+            runnable.append(job)
+            continue
+
+        source = os.path.abspath(job['path'])
+        kind = export_kind(job)
+        skip = []
+        for output_name, box in outputs:
+            signature = output_signature(job['path'], box, job['profile'], output_name)
+            planned[output_name] = {'signature': signature, 'source': source, 'kind': kind}
+            if (previous.get(output_name, {}).get('signature') == signature
+                    and os.path.exists(os.path.join(output_folder, output_name))):
+                skip.append(output_name)
+
+        stats['unchanged'] += len(skip)
+        if len(skip) < len(outputs):
+            runnable.append({**job, 'skip_outputs': skip})
+    return runnable, planned
+
+
+def finish_incremental(jobs, output_folder, previous, planned, stats):
+    manifest = dict(previous)
+    written = {os.path.basename(record['path']) for record in stats['files']}
+    failed = {os.path.abspath(path) for path, _ in stats['errors']}
+    for output_name, entry in planned.items():
+        if entry['source'] in failed:
+            continue
+        if output_name in written or previous.get(output_name, {}).get('signature') == entry['signature']:
+            manifest[output_name] = entry
+
+    if not stats['cancelled']:
+        # Só apaga arquivos do mesmo tipo de exportação e das mesmas imagens; outras exportações
+        # na mesma pasta continuam intactas
+        sources = {
+            (os.path.abspath(job['path']), export_kind(job)) for job in jobs
+            if os.path.abspath(job['path']) not in failed
+        }
+        for output_name, entry in previous.items():
+            if output_name not in planned and (entry['source'], entry.get('kind')) in sources:
+                try:
+                    os.remove(os.path.join(output_folder, output_name))
+                    stats['deleted'] += 1
+                except FileNotFoundError:
+                    pass
+                manifest.pop(output_name, None)
+
+    write_export_manifest(output_folder, manifest)
+
+
+def make_job(path, display_name, horizontal_slices, crop_box=None, profile=None):
+    return {
+        'profile': make_profile(profile),
+        'path': path,
+        'display_name': display_name,
+        'horizontal_slices': None if horizontal_slices is None else sorted(horizontal_slices),
+        'crop_box': tuple(crop_box) if crop_box else None,
+    }
+
+
+def list_images(folder):
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+    )
+
+
+def jobs_from_folder(folder, horizontal_slices, start_num=1, profile=None):
+    return [
+        make_job(path, sequence_name(path, i), horizontal_slices, profile=profile)
+        for i, path in enumerate(list_images(folder), start=start_num)
+    ]
+
+
+def auto_jobs_from_folder(folder, mode, limit, start_num=1, profile=None, snap_rows=150):
+    # Cada imagem é decodificada para planejar seus cortes por altura ou por tamanho
+    profile = make_profile(profile)
+    jobs = []
+    for i, path in enumerate(list_images(folder), start=start_num):
+        display_name = sequence_name(path, i)
+        ext = output_ext(os.path.splitext(path)[1].lower(), profile)
+        with Image.open(path) as image:
+            horizontal_slices = auto_slices(image, mode, limit, profile, ext, snap_rows)
+        jobs.append(make_job(path, display_name, horizontal_slices, profile=profile))
+    return jobs
+
+
+def jobs_from_manifest(manifest_path, start_num=1, profile=None):
+    # Formato: {"images": [{"path": ..., "horizontal_slices": [...], "crop_box": [esq, topo, dir, base]}]}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_folder = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    for i, entry in enumerate(manifest['images'], start=start_num):
+        path = os.path.join(base_folder, entry['path'])
+        display_name = entry.get('display_name') or sequence_name(path, i)
+        jobs.append(make_job(
+            path, display_name, entry.get('horizontal_slices', []), entry.get('crop_box'),
+            {**(profile or {}), **entry.get('profile', {})}
+        ))
+    return jobs
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def new_stats():
+    return {'images': 0, 'slices': 0, 'skipped': 0, 'errors': [], 'cancelled': False,
+            'bytes': 0, 'encode_seconds': 0.0, 'files': [], 'unchanged': 0, 'deleted': 0}
+
+
+def finish_stats(stats, started):
+    stats['elapsed'] = time.perf_counter() - started
+    stats['images_per_second'] = stats['images'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    return stats
+
+
+def _record_saved(stats, saved):
+    stats['slices'] += len(saved)
+    for record in saved:
+        stats['bytes'] += record['bytes']
+        stats['encode_seconds'] += record['encode_seconds']
+        stats['files'].append(record)
+
+
+def _record_result(stats, job, saved, error, log):
+    if error is not None:
+        stats['errors'].append((job['path'], error))
+        if log:
+            log(f"Erro em {job['path']}: {error}")
+        return
+    stats['images'] += 1
+    _record_saved(stats, saved)
+
+
+def _run_sequential(jobs, output_folder, stats, on_progress, cancel_event, log):
+    for done, job in enumerate(jobs, 1):
+        if cancel_event is not None and cancel_event.is_set():
+            stats['cancelled'] = True
+            return
+        try:
+            _record_result(stats, job, export_job(job, output_folder), None, log)
+        except Exception as e:
+            _record_result(stats, job, None, str(e), log)
+        if on_progress:
+            on_progress(done, len(jobs))
+
+
+def _run_pool(jobs, output_folder, workers, stats, on_progress, cancel_event, log):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(export_job, job, output_folder): job for job in jobs}
+        done_count = 0
+
+        while pending:
+            # Espera curta para que o cancelamento seja percebido mesmo com imagens grandes
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    _record_result(stats, job, future.result(), None, log)
+                except Exception as e:
+                    _record_result(stats, job, None, str(e), log)
+                done_count += 1
+                if on_progress:
+                    on_progress(done_count, len(jobs))
+
+            if cancel_event is not None and cancel_event.is_set():
+                stats['cancelled'] = True
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True, cancel_futures=True)
+                return
+
+
+def run_batch(jobs, output_folder, workers=1, on_progress=None, cancel_event=None, log=None, incremental=False):
+    os.makedirs(output_folder, exist_ok=True)
+    stats = new_stats()
+    started = time.perf_counter()
+
+    valid = []
+    for job in jobs:
+        if job['horizontal_slices'] is not None and not has_valid_slices(job['horizontal_slices']):
+            stats['skipped'] += 1
+        else:
+            valid.append(job)
+
+    runnable = valid
+    if incremental:
+        previous = read_export_manifest(output_folder)
+        runnable, planned = plan_incremental(valid, output_folder, previous, stats)
+
+    if workers > 1 and len(runnable) > 1:
+        _run_pool(runnable, output_folder, min(workers, len(runnable)), stats, on_progress, cancel_event, log)
+    else:
+        _run_sequential(runnable, output_folder, stats, on_progress, cancel_event, log)
+
+    if incremental:
+        finish_incremental(valid, output_folder, previous, planned, stats)
+    return finish_stats(stats, started)
+
+
+class VirtualStrip:
+    # O capítulo inteiro visto como uma tira contínua, sem nunca montar a tira na memória
+    def __init__(self, pages, width=None):
+        # pages: lista de (caminho, crop_box, (largura, altura)) já considerando o recorte
+        self.pages = pages
+        self.width = width or pages[0][2][0]
+        self.heights = [round(page_height * self.width / page_width) for _, _, (page_width, page_height) in pages]
+        self.offsets = [0]
+        for height in self.heights:
+            self.offsets.append(self.offsets[-1] + height)
+        self.height = self.offsets[-1]
+
+    def page_at(self, y):
+        return bisect.bisect_right(self.offsets, y) - 1
+
+    def load_page(self, index):
+        path, crop_box, _ = self.pages[index]
+        image = open_source({'path': path, 'crop_box': crop_box}).convert('RGB')
+        # Páginas com largura diferente são escaladas para a largura da tira
+        if image.size[0] != self.width:
+            image = image.resize((self.width, self.heights[index]), Image.Resampling.LANCZOS)
+        return image
+
+    def segments(self, cuts):
+        # cuts: posições globais em pixels; os pedaços ficam entre cortes consecutivos
+        bounds = sorted({0, self.height, *(min(max(int(cut), 0), self.height) for cut in cuts)})
+        return list(zip(bounds, bounds[1:]))
+
+    def uniform_segments(self, segment_height):
+        return [(y, min(y + segment_height, self.height)) for y in range(0, self.height, segment_height)]
+
+    def render_segments(self, segments):
+        # Só a página atual fica decodificada; ao passar dela, é descartada
+        cached_index, cached_image = None, None
+        for start, end in segments:
+            output = Image.new('RGB', (self.width, end - start), 'white')
+            index = self.page_at(start)
+            while index < len(self.pages) and self.offsets[index] < end:
+                page_top = self.offsets[index]
+                top, bottom = max(start, page_top), min(end, page_top + self.heights[index])
+                if bottom > top:
+                    if cached_index != index:
+                        cached_index, cached_image = index, self.load_page(index)
+                    output.paste(cached_image.crop((0, top - page_top, self.width, bottom - page_top)), (0, top - start))
+                index += 1
+            yield output
+
+
+def strip_pages(paths):
+    pages = []
+    for path in paths:
+        with Image.open(path) as image:
+            pages.append((path, None, image.size))
+    return pages
+
+
+def run_recut(strip, segments, output_folder, ext='.png', start_num=1, on_progress=None, cancel_event=None,
+              profile=None):
+    os.makedirs(output_folder, exist_ok=True)
+    profile = make_profile(profile)
+    stats = new_stats()
+    started = time.perf_counter()
+
+    for number, image in enumerate(strip.render_segments(segments), start=start_num):
+        if cancel_event is not None and cancel_event.is_set():
+            stats['cancelled'] = True
+            break
+        output_path = os.path.join(output_folder, output_filename(f"{number}{ext}", profile))
+        try:
+            saved = save_image(image, output_path, profile)
+        except Exception as e:
+            stats['errors'].append((output_path, str(e)))
+        else:
+            stats['images'] += 1
+            _record_saved(stats, [saved])
+        if on_progress:
+            on_progress(number - start_num + 1, len(segments))
+
+    return finish_stats(stats, started)
+
+
+def add_profile_arguments(parser, report=True):
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='original', help="Formato de saída")
+    parser.add_argument('--quality', type=int, default=DEFAULT_PROFILE['quality'], help="Qualidade JPEG/WebP (1-100)")
+    parser.add_argument('--progressive', action='store_true', help="JPEG progressivo")
+    parser.add_argument('--optimize', action='store_true', help="Otimização extra de JPEG/PNG (mais lenta)")
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_PROFILE['compress_level'],
+                        help="Nível de compressão PNG (0-9)")
+    parser.add_argument('--palette', type=int, default=0, help="Quantiza PNG para N cores")
+    parser.add_argument('--lossless', action='store_true', help="WebP sem perdas")
+    parser.add_argument('--method', type=int, default=DEFAULT_PROFILE['method'], help="Esforço do WebP (0-6)")
+    if report:
+        parser.add_argument('--report', help="Grava tempo de codificação e tamanho de cada arquivo em JSON")
+
+
+def profile_from_args(args):
+    return make_profile({
+        'format': args.format, 'quality': args.quality, 'progressive': args.progressive,
+        'optimize': args.optimize, 'compress_level': args.compress_level,
+        'palette_colors': args.palette, 'lossless': args.lossless, 'method': args.method,
+    })
+
+
+def print_summary(stats, report_path=None):
+    print(f"{stats['images']} imagens, {stats['slices']} arquivos, {stats['bytes'] / 2**20:.2f} MB em "
+          f"{stats['elapsed']:.2f}s ({stats['images_per_second']:.1f} imagens/s, "
+          f"{stats['encode_seconds']:.2f}s codificando)")
+    if stats['unchanged'] or stats['deleted']:
+        print(f"{stats['unchanged']} arquivos sem alteração, {stats['deleted']} arquivos órfãos removidos")
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Cortador de imagens sem interface gráfica")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    slice_parser = subparsers.add_parser('slice', help="Corta uma pasta ou um manifesto de imagens")
+    source = slice_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--folder', help="Pasta com as imagens (cortes de --cuts aplicados a todas)")
+    source.add_argument('--manifest', help="Manifesto JSON com imagens e posições de corte")
+    slice_parser.add_argument('--cuts', type=float, nargs='+', default=[],
+                              help="Cortes horizontais em porcentagem, em pares (início fim)")
+    slice_parser.add_argument('--max-height', type=int,
+                              help="Em vez de --cuts, fatia cada imagem em pedaços de até N pixels")
+    slice_parser.add_argument('--max-kb', type=int,
+                              help="Em vez de --cuts, fatia cada imagem em arquivos de até N KB (estimado)")
+    slice_parser.add_argument('--snap', type=int, default=150,
+                              help="Linhas que um corte automático pode recuar até uma faixa lisa (0 = exato)")
+    slice_parser.add_argument('--start', type=int, default=1, help="Número inicial da sequência de nomes")
+    slice_parser.add_argument('--workers', type=int, default=default_workers(),
+                              help="Número de processos de exportação (1 = sem paralelismo)")
+    slice_parser.add_argument('--incremental', action='store_true',
+                              help="Só grava os cortes que mudaram desde a última exportação e apaga os órfãos")
+    slice_parser.add_argument('-o', '--output', required=True, help="Pasta de saída")
+    add_profile_arguments(slice_parser)
+
+    recut_parser = subparsers.add_parser('recut', help="Junta as páginas de uma pasta e recorta a tira contínua")
+    recut_parser.add_argument('--folder', required=True, help="Pasta com as páginas do capítulo, em ordem de nome")
+    cuts = recut_parser.add_mutually_exclusive_group(required=True)
+    cuts.add_argument('--height', type=int, help="Altura fixa de cada pedaço, em pixels")
+    cuts.add_argument('--cuts', type=int, nargs='+', help="Posições globais dos cortes, em pixels")
+    cuts.add_argument('--max-kb', type=int, help="Pedaços de até N KB (estimado)")
+    recut_parser.add_argument('--snap', type=int, default=0,
+                              help="Linhas que cada corte pode recuar até uma faixa lisa (0 = exato)")
+    recut_parser.add_argument('--width', type=int, help="Largura da tira (padrão: largura da primeira página)")
+    recut_parser.add_argument('--ext', default='.png', help="Extensão dos arquivos de saída")
+    recut_parser.add_argument('--start', type=int, default=1, help="Número inicial da sequência de nomes")
+    recut_parser.add_argument('-o', '--output', required=True, help="Pasta de saída")
+    add_profile_arguments(recut_parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    limits = [getattr(args, name, None) for name in ('max_height', 'max_kb', 'height')]
+    if any(limit is not None and limit <= 0 for limit in limits):
+        print("O limite de cada pedaço precisa ser maior que zero", file=sys.stderr)
+        return 2
+
+    if args.command == 'slice':
+        if args.folder and (args.max_height or args.max_kb):
+            mode, limit = ('height', args.max_height) if args.max_height else ('bytes', args.max_kb * 1024)
+            jobs = auto_jobs_from_folder(args.folder, mode, limit, args.start, profile_from_args(args), args.snap)
+        elif args.folder:
+            if not has_valid_slices(args.cuts):
+                print("Informe cortes horizontais em pares com --cuts", file=sys.stderr)
+                return 2
+            jobs = jobs_from_folder(args.folder, args.cuts, args.start, profile_from_args(args))
+        else:
+            jobs = jobs_from_manifest(args.manifest, args.start, profile_from_args(args))
+
+        stats = run_batch(jobs, args.output, workers=args.workers, log=lambda msg: print(msg, file=sys.stderr),
+                          incremental=args.incremental)
+        print_summary(stats, args.report)
+        return 1 if stats['errors'] else 0
+
+    if args.command == 'recut':
+        strip = VirtualStrip(strip_pages(list_images(args.folder)), args.width)
+        profile = profile_from_args(args)
+        if args.max_kb or (args.height and args.snap):
+            mode, limit = ('height', args.height) if args.height else ('bytes', args.max_kb * 1024)
+            segments = plan_strip(strip, mode, limit, profile, output_ext(args.ext, profile), args.snap)
+        elif args.height:
+            segments = strip.uniform_segments(args.height)
+        else:
+            segments = strip.segments(args.cuts)
+        stats = run_recut(strip, segments, args.output, args.ext, args.start, profile=profile)
+        print(f"{len(strip.pages)} páginas ({strip.height}px) em {stats['images']} pedaços")
+        print_summary(stats, args.report)
+        return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
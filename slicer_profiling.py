@@ -0,0 +1,69 @@
+import cProfile
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class StageTimer:
+    # Guarda as últimas medições de cada etapa; a thread do Tk e as threads de fundo registram no mesmo lugar
+    def __init__(self, history=120):
+        self.history = history
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.history)
+            self.samples[name].append(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self.samples.items()}
+        return {
+            name: {
+                'count': len(values),
+                'last_ms': round(values[-1] * 1000, 2),
+                'avg_ms': round(sum(values) / len(values) * 1000, 2),
+                'max_ms': round(max(values) * 1000, 2),
+            }
+            for name, values in samples.items() if values
+        }
+
+    def overlay_text(self):
+        lines = [f"{'etapa':<18}{'última':>9}{'média':>9}{'máx':>9}"]
+        for name, stats in sorted(self.summary().items()):
+            lines.append(f"{name:<18}{stats['last_ms']:>9.1f}{stats['avg_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+        return "\n".join(lines) + "\n(ms, últimas medições)"
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+# Instância única compartilhada por interface, caches e threads de fundo
+timer = StageTimer()
+
+
+class SessionProfiler:
+    # cProfile só enxerga a thread em que foi ligado; aqui, a thread do Tk
+    def __init__(self, path):
+        self.path = path
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
@@ -0,0 +1,169 @@
+import json
+import os
+
+PROJECT_VERSION = 1
+DEFAULT_PROJECT_PATH = os.path.join(os.path.expanduser('~'), '.lility_imagem', 'sessao.jsonl')
+INFO_KEYS = ('path', 'display_name', 'original_name', 'size')
+STATE_KEYS = ('horizontal_slices', 'vertical_slices', 'crop_history', 'redo_history')
+
+
+def image_info(entry):
+    return {key: entry[key] for key in INFO_KEYS}
+
+
+def image_state(entry):
+    return {key: list(entry[key]) for key in STATE_KEYS}
+
+
+def restore_entry(record):
+    # JSON devolve listas; tamanho e retângulos de recorte voltam a ser tuplas porque servem de chave de cache
+    return {
+        'path': record['path'],
+        'display_name': record['display_name'],
+        'original_name': record['original_name'],
+        'size': tuple(record['size']),
+        'horizontal_slices': list(record.get('horizontal_slices', [])),
+        'vertical_slices': list(record.get('vertical_slices', [])),
+        'crop_history': [tuple(box) for box in record.get('crop_history', [])],
+        'redo_history': [tuple(box) for box in record.get('redo_history', [])],
+        'cropped_images': []
+    }
+
+
+def read_project(path):
+    project = {'sequence_start': 1, 'current_index': 0, 'images': [], 'records': 0}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Uma queda no meio da gravação deixa no máximo a última linha incompleta
+                break
+            project['records'] += 1
+            try:
+                apply_record(project, record)
+            except (KeyError, TypeError, ValueError, AttributeError, IndexError):
+                # Registro malformado: é ignorado e a compactação seguinte o descarta
+                continue
+    return project
+
+
+def apply_record(project, record):
+    kind = record.get('type')
+    if kind == 'header':
+        project['sequence_start'] = int(record.get('sequence_start', 1))
+    elif kind == 'sequence':
+        project['sequence_start'] = int(record['start'])
+    elif kind == 'add':
+        # Valida o registro antes de aceitá-lo, para que entries() não falhe depois
+        restore_entry(record['image'])
+        project['images'].append(dict(record['image']))
+    elif kind == 'state' and 0 <= int(record['index']) < len(project['images']):
+        index = int(record['index'])
+        image = {**project['images'][index], **record['state']}
+        restore_entry(image)
+        project['images'][index] = image
+    elif kind == 'current':
+        project['current_index'] = int(record['index'])
+    elif kind == 'clear':
+        project['images'] = []
+        project['current_index'] = 0
+
+
+class ProjectJournal:
+    # Diário só de acréscimos: cada edição grava uma linha pequena e o arquivo inteiro
+    # só é reescrito na compactação, quando o diário cresce demais. Sem caminho o diário
+    # fica só na memória, até que save_as lhe dê um arquivo
+    def __init__(self, path, autosave=True, compact_ratio=4):
+        self.path = path
+        self.autosave = autosave
+        self.compact_ratio = compact_ratio
+        self.stale = False
+
+        if path and os.path.exists(path):
+            project = read_project(path)
+        else:
+            project = {'sequence_start': 1, 'current_index': 0, 'images': [], 'records': 0}
+        self.sequence_start = project['sequence_start']
+        self.current_index = project['current_index']
+        self.images = project['images']
+        self.records = project['records']
+
+        folder = os.path.dirname(path) if path else None
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if self.autosave:
+            self.compact()
+        else:
+            self.stale = True
+
+    def entries(self):
+        return [restore_entry(record) for record in self.images]
+
+    def append(self, record):
+        if not self.autosave:
+            self.stale = True
+            return
+        if self.stale or self.records > self.compact_ratio * len(self.images) + 64:
+            # Mudanças feitas com o autosave desligado ou diário longo: grava o estado atual de uma vez
+            self.compact()
+            return
+
+        if not self.path:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.records += 1
+
+    def add_images(self, entries, sequence_start):
+        if sequence_start != self.sequence_start:
+            self.sequence_start = sequence_start
+            self.append({'type': 'sequence', 'start': sequence_start})
+        for entry in entries:
+            record = {**image_info(entry), **image_state(entry)}
+            self.images.append(record)
+            self.append({'type': 'add', 'image': record})
+
+    def save_state(self, index, entry):
+        state = image_state(entry)
+        self.images[index].update(state)
+        self.append({'type': 'state', 'index': index, 'state': state})
+
+    def drop_missing(self):
+        missing = [record['path'] for record in self.images if not os.path.exists(record['path'])]
+        if missing:
+            # Os índices dos registros mudam, então o diário é reescrito
+            self.images = [record for record in self.images if os.path.exists(record['path'])]
+            self.current_index = min(self.current_index, max(len(self.images) - 1, 0))
+            self.stale = True
+            self.append({'type': 'clear'})
+        return missing
+
+    def set_current(self, index):
+        if index != self.current_index:
+            self.current_index = index
+            self.append({'type': 'current', 'index': index})
+
+    def clear(self):
+        self.images = []
+        self.current_index = 0
+        self.append({'type': 'clear'})
+
+    def compact(self):
+        if not self.path:
+            self.stale = False
+            return
+        lines = [{'type': 'header', 'version': PROJECT_VERSION, 'sequence_start': self.sequence_start}]
+        lines.extend({'type': 'add', 'image': record} for record in self.images)
+        lines.append({'type': 'current', 'index': self.current_index})
+
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(line, separators=(',', ':')) + '\n' for line in lines)
+        os.replace(temporary, self.path)
+        self.records = len(lines)
+        self.stale = False
+
+    def save_as(self, path):
+        self.path = path
+        self.compact()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from slicer_engine import (
+    IMAGE_EXTENSIONS, add_profile_arguments, default_workers, detect_gutters, jobs_from_manifest,
+    list_images, make_job, profile_from_args, run_batch, sequence_name
+)
+
+# Um corte.json na pasta do capítulo (mesmo formato do --manifest) tem prioridade sobre a detecção automática
+RULES_FILE = 'corte.json'
+PARTIAL_SUFFIXES = ('.part', '.partial', '.tmp', '.crdownload', '.download', '.filepart')
+
+
+def snapshot(folder):
+    # Nome, tamanho e data de cada arquivo; se nada muda durante a espera, o envio terminou
+    files = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def is_complete(files):
+    names = [name.lower() for name in files]
+    has_images = any(os.path.splitext(name)[1] in IMAGE_EXTENSIONS for name in names)
+    return has_images and not any(name.endswith(PARTIAL_SUFFIXES) for name in names)
+
+
+def chapter_jobs(folder, profile):
+    rules = os.path.join(folder, RULES_FILE)
+    if os.path.exists(rules):
+        return jobs_from_manifest(rules, profile=profile)
+
+    jobs = []
+    for number, path in enumerate(list_images(folder), 1):
+        try:
+            with Image.open(path) as image:
+                horizontal_slices = detect_gutters(image)
+        except Exception:
+            # Página ilegível vai inteira para run_batch, que registra o erro só dela
+            horizontal_slices = None
+        # Sem painéis detectados a página é exportada inteira em vez de ser descartada
+        jobs.append(make_job(path, sequence_name(path, number), horizontal_slices or None, profile=profile))
+    return jobs
+
+
+def process_chapter(folder, output_folder, profile):
+    # Roda num processo do pool; a exportação incremental torna barato reprocessar um capítulo que recebeu páginas novas
+    stats = run_batch(chapter_jobs(folder, profile), output_folder, incremental=True)
+    stats.pop('files')
+    return stats
+
+
+def percentile(values, q):
+    return round(float(np.percentile(values, q)), 3) if values else None
+
+
+class ChapterWatcher:
+    def __init__(self, roots, output_root, profile, workers=1, settle_seconds=5.0, log=None):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.output_root = os.path.abspath(output_root)
+        self.profile = profile
+        self.workers = workers
+        self.settle_seconds = settle_seconds
+        self.log = log or (lambda message: None)
+
+        self.settling = {}    # pasta -> {'snapshot', 'first_seen', 'changed'}
+        self.queue = deque()  # (pasta, snapshot, first_seen, queued)
+        self.running = {}     # future -> (pasta, snapshot, first_seen, started)
+        self.processed = {}   # pasta -> snapshot da última exportação
+        self.latencies = []   # da primeira vez que o capítulo foi visto até o fim da exportação
+        self.processing = []  # só o tempo de exportação
+        self.waits = []       # tempo na fila
+        self.completed = 0
+        self.failed = 0
+
+    def chapter_folders(self):
+        for root in self.roots:
+            try:
+                with os.scandir(root) as entries:
+                    folders = sorted(entry.path for entry in entries if entry.is_dir())
+            except FileNotFoundError:
+                continue
+            for folder in folders:
+                # A pasta de saída pode estar dentro da pasta vigiada
+                if os.path.abspath(folder) != self.output_root:
+                    yield folder
+
+    def busy(self, folder):
+        return (any(item[0] == folder for item in self.queue)
+                or any(item[0] == folder for item in self.running.values()))
+
+    def scan(self, now):
+        for folder in self.chapter_folders():
+            if self.busy(folder):
+                continue
+            try:
+                files = snapshot(folder)
+            except OSError:
+                continue
+            if self.processed.get(folder) == files:
+                continue
+
+            seen = self.settling.get(folder)
+            if seen is None or seen['snapshot'] != files:
+                self.settling[folder] = {
+                    'snapshot': files,
+                    'first_seen': seen['first_seen'] if seen else now,
+                    'changed': now,
+                }
+            elif now - seen['changed'] >= self.settle_seconds:
+                del self.settling[folder]
+                if not is_complete(files):
+                    # Pasta parada sem imagens ou com envio pela metade; só volta a ser vista quando mudar
+                    self.processed[folder] = files
+                    self.log(f"Ignorada até mudar: {os.path.basename(folder)} (sem imagens ou com arquivos parciais)")
+                    continue
+                self.queue.append((folder, files, seen['first_seen'], now))
+                self.log(f"Na fila: {os.path.basename(folder)} ({len(files)} arquivos)")
+
+    def dispatch(self, executor, now):
+        while self.queue and len(self.running) < self.workers:
+            folder, files, first_seen, queued = self.queue.popleft()
+            self.waits.append(now - queued)
+            output_folder = os.path.join(self.output_root, os.path.basename(folder))
+            future = executor.submit(process_chapter, folder, output_folder, self.profile)
+            self.running[future] = (folder, files, first_seen, now)
+
+    def collect(self, now):
+        for future in [future for future in self.running if future.done()]:
+            folder, files, first_seen, started = self.running.pop(future)
+            name = os.path.basename(folder)
+            # Mesmo com erros o capítulo não é refeito até que seus arquivos mudem
+            self.processed[folder] = files
+            try:
+                stats = future.result()
+            except Exception as e:
+                self.failed += 1
+                self.log(f"Erro em {name}: {e}")
+                continue
+
+            self.completed += 1
+            self.processing.append(now - started)
+            self.latencies.append(now - first_seen)
+            self.log(f"Concluído: {name}: {stats['slices']} arquivos gravados, {stats['unchanged']} sem alteração, "
+                     f"{len(stats['errors'])} erro(s) em {now - started:.1f}s")
+            for path, error in stats['errors']:
+                self.log(f"  {os.path.basename(path)}: {error}")
+
+    def idle(self):
+        return not (self.settling or self.queue or self.running)
+
+    def metrics(self):
+        return {
+            'queue_depth': len(self.queue),
+            'running': len(self.running),
+            'settling': len(self.settling),
+            'completed': self.completed,
+            'failed': self.failed,
+            'latency_p50_s': percentile(self.latencies, 50),
+            'latency_p90_s': percentile(self.latencies, 90),
+            'processing_p50_s': percentile(self.processing, 50),
+            'processing_p90_s': percentile(self.processing, 90),
+            'queue_wait_p50_s': percentile(self.waits, 50),
+        }
+
+    def run(self, interval=2.0, once=False, metrics_path=None):
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.collect(now)
+                    self.scan(now)
+                    self.dispatch(executor, now)
+                    if metrics_path:
+                        write_metrics(metrics_path, self.metrics())
+                    if once and self.idle():
+                        return self.metrics()
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                executor.shutdown(wait=True, cancel_futures=True)
+                return self.metrics()
+
+
+def write_metrics(path, metrics):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Vigia pastas e corta automaticamente cada capítulo (subpasta) que chega"
+    )
+    parser.add_argument('folders', nargs='+', help="Pastas vigiadas; cada subpasta é um capítulo")
+    parser.add_argument('-o', '--output', required=True, help="Pasta de saída (uma subpasta por capítulo)")
+    parser.add_argument('--workers', type=int, default=default_workers(), help="Capítulos processados em paralelo")
+    parser.add_argument('--interval', type=float, default=2.0, help="Segundos entre varreduras")
+    parser.add_argument('--settle', type=float, default=5.0,
+                        help="Segundos sem mudanças antes de considerar o envio de um capítulo completo")
+    parser.add_argument('--once', action='store_true', help="Processa o que já está nas pastas e termina")
+    parser.add_argument('--metrics', help="Arquivo JSON atualizado a cada varredura com fila e latências")
+    add_profile_arguments(parser, report=False)
+    args = parser.parse_args(argv)
+
+    watcher = ChapterWatcher(
+        args.folders, args.output, profile_from_args(args), workers=max(args.workers, 1),
+        settle_seconds=args.settle, log=lambda message: print(message, file=sys.stderr)
+    )
+    metrics = watcher.run(args.interval, args.once, args.metrics)
+    print(json.dumps(metrics, indent=2))
+    return 1 if metrics['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
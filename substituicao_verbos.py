@@ -0,0 +1,90 @@
+import json
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+ARQUIVO_REGRAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regras_verbos.json')
+PADRAO_PALAVRA = re.compile(r'\w+')
+
+
+def carregar_regras(caminho=ARQUIVO_REGRAS):
+    """Lê a tabela {palavra: substituta} do arquivo JSON editável."""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        regras = json.load(f)
+
+    invalidas = [palavra for palavra in regras if not PADRAO_PALAVRA.fullmatch(palavra)]
+    if invalidas:
+        raise ValueError(f"Regras devem ser palavras isoladas: {', '.join(invalidas[:5])}")
+    return {palavra.lower(): substituta for palavra, substituta in regras.items()}
+
+
+def preservar_caso(palavra, substituta):
+    if palavra.istitle():
+        return substituta.title()
+    elif palavra.isupper():
+        return substituta.upper()
+    return substituta
+
+
+@lru_cache(maxsize=64)
+def compilar_padrao(palavras):
+    # Só as palavras da tabela que aparecem no texto entram na expressão, então ela
+    # fica pequena mesmo com milhares de regras. O cache fica no módulo e é indexado só
+    # pelas palavras, para não prender instâncias antigas depois de recarregar as regras
+    alternativas = '|'.join(re.escape(palavra) for palavra in sorted(palavras, key=len, reverse=True))
+    return re.compile(r'\b(?:' + alternativas + r')\b', re.IGNORECASE)
+
+
+class SubstituidorVerbos:
+    """Aplica a tabela de regras numa única passada, com custo linear no tamanho do texto."""
+    def __init__(self, regras):
+        self.regras = dict(regras)
+
+    @classmethod
+    def do_arquivo(cls, caminho=ARQUIVO_REGRAS):
+        return cls(carregar_regras(caminho))
+
+    def trocas(self, texto):
+        """Lista de (início, fim, substituta) de cada palavra da tabela no texto."""
+        encontradas = self.regras.keys() & set(PADRAO_PALAVRA.findall(texto.lower()))
+        if not encontradas:
+            return []
+        return [
+            (match.start(), match.end(), preservar_caso(match.group(0), self.regras[match.group(0).lower()]))
+            for match in compilar_padrao(frozenset(encontradas)).finditer(texto)
+        ]
+
+    def substituir(self, texto):
+        """Devolve (texto_modificado, Counter {palavra da regra: ocorrências})."""
+        # findall e a interseção com a tabela rodam em C; sem nenhuma regra presente, o texto volta intacto
+        encontradas = self.regras.keys() & set(PADRAO_PALAVRA.findall(texto.lower()))
+        contagens = Counter()
+        if not encontradas:
+            return texto, contagens
+
+        def substituir_palavra(match):
+            palavra = match.group(0)
+            regra = palavra.lower()
+            contagens[regra] += 1
+            return preservar_caso(palavra, self.regras[regra])
+
+        return compilar_padrao(frozenset(encontradas)).sub(substituir_palavra, texto), contagens
+
+    def substituir_blocos(self, blocos, contagens):
+        """Substitui bloco a bloco, somando em contagens; a palavra cortada no fim de um bloco espera o próximo."""
+        pendente = ''
+        for bloco in blocos:
+            bloco = pendente + bloco
+            corte = len(bloco)
+            while corte and (bloco[corte - 1].isalnum() or bloco[corte - 1] == '_'):
+                corte -= 1
+            bloco, pendente = bloco[:corte], bloco[corte:]
+            if bloco:
+                texto, encontradas = self.substituir(bloco)
+                contagens.update(encontradas)
+                yield texto
+        if pendente:
+            texto, encontradas = self.substituir(pendente)
+            contagens.update(encontradas)
+            yield texto
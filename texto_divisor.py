@@ -0,0 +1,305 @@
+import codecs
+import math
+import mmap
+import os
+import re
+
+TAMANHO_BLOCO = 1 << 20
+TAMANHO_AMOSTRA = 1 << 16
+AMOSTRAS_ENCODING = 16
+# UTF-32 LE começa com o mesmo BOM do UTF-16 LE, então é testado antes
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'), (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Custo de terminar um trecho em cada tipo de limite, somado ao desvio do tamanho ideal
+PENALIDADES = {'frase': 0.0, 'paragrafo': 0.0, 'oracao': 0.5, 'palavra': 2.0, 'forcado': 10.0}
+PADRAO_LIMITES = re.compile(r'(?P<frase>[.!?…]+["”’»)\]]*)|(?P<paragrafo>\n)|(?P<oracao>[,;:])')
+FINAIS_DE_FRASE = ('.', '!', '?', '…')
+# Quantos limites no máximo a divisão equilibrada compara em cada janela de limite_max - limite_min
+LIMITES_POR_JANELA = 8
+
+
+def detectar_encoding(dados):
+    """BOM, depois UTF-8 e por fim cp1252 ou latin-1, testando amostras espalhadas pelo arquivo."""
+    for bom, encoding in BOMS:
+        if dados[:len(bom)] == bom:
+            return encoding
+
+    total = len(dados)
+    passo = max(total // AMOSTRAS_ENCODING, TAMANHO_AMOSTRA)
+    utf8 = cp1252 = True
+    for inicio in range(0, total, passo):
+        amostra = dados[inicio:inicio + TAMANHO_AMOSTRA]
+        if utf8:
+            # Fora do início a amostra pode cair no meio de um caractere multibyte
+            corte = 0
+            while inicio and corte < min(3, len(amostra)) and 0x80 <= amostra[corte] <= 0xBF:
+                corte += 1
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(amostra[corte:], inicio + TAMANHO_AMOSTRA >= total)
+            except UnicodeDecodeError:
+                utf8 = False
+        if cp1252:
+            try:
+                amostra.decode('cp1252')
+            except UnicodeDecodeError:
+                cp1252 = False
+
+    if utf8:
+        return 'utf-8'
+    # latin-1 aceita qualquer byte; cp1252 só perde para ele quando usa bytes que não define
+    return 'cp1252' if cp1252 else 'latin-1'
+
+
+def mapear(f):
+    # mmap não aceita arquivos vazios
+    if os.fstat(f.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def detectar_encoding_arquivo(caminho):
+    with open(caminho, 'rb') as f:
+        dados = mapear(f)
+        try:
+            return detectar_encoding(dados)
+        finally:
+            if dados:
+                dados.close()
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding=None):
+    """Lê o arquivo mapeado em memória em blocos de texto, sem carregá-lo inteiro."""
+    with open(caminho, 'rb') as f:
+        dados = mapear(f)
+        try:
+            decodificador = codecs.getincrementaldecoder(encoding or detectar_encoding(dados))()
+            pendente = ''
+            for inicio in range(0, len(dados) + 1, tamanho_bloco):
+                final = inicio + tamanho_bloco >= len(dados)
+                bloco = pendente + decodificador.decode(dados[inicio:inicio + tamanho_bloco], final)
+                # Um \r no fim do bloco pode ser metade de um \r\n; espera o próximo bloco
+                pendente = ''
+                if bloco.endswith('\r') and not final:
+                    bloco, pendente = bloco[:-1], '\r'
+                # Mesma conversão de quebras de linha que open() faz em modo texto
+                bloco = bloco.replace('\r\n', '\n').replace('\r', '\n')
+                if bloco:
+                    yield bloco
+                if final:
+                    return
+        finally:
+            if dados:
+                dados.close()
+
+
+def aparar(blocos):
+    """Equivalente a texto.strip() sobre uma sequência de blocos."""
+    inicio = True
+    espacos_pendentes = ''
+    for bloco in blocos:
+        if inicio:
+            bloco = bloco.lstrip()
+            if not bloco:
+                continue
+            inicio = False
+
+        conteudo = bloco.rstrip()
+        if not conteudo:
+            # Bloco só de espaços: só entra se aparecer texto depois dele
+            espacos_pendentes += bloco
+            continue
+        yield espacos_pendentes + conteudo
+        espacos_pendentes = bloco[len(conteudo):]
+
+
+def dividir_em_trechos(blocos, limite_min=1300, limite_max=1500):
+    """Gera os mesmos trechos de dividir_texto lendo o texto bloco a bloco."""
+    blocos = iter(blocos)
+    buffer = ''
+    inicio = 0
+    fim_do_texto = False
+
+    while True:
+        # Cada trecho precisa ver até limite_max + 1 caracteres à frente; o buffer só é
+        # refeito quando falta texto, então cada caractere é copiado uma única vez
+        while not fim_do_texto and len(buffer) - inicio <= limite_max:
+            bloco = next(blocos, None)
+            if bloco is None:
+                fim_do_texto = True
+            else:
+                buffer = buffer[inicio:] + bloco
+                inicio = 0
+
+        if inicio >= len(buffer):
+            return
+
+        fim = min(inicio + limite_max, len(buffer))
+        fim_trecho = max(buffer.rfind('.', inicio, fim), buffer.rfind(',', inicio, fim))
+
+        if fim_trecho == -1 or fim_trecho < inicio + limite_min:
+            fim_trecho = fim
+
+        trecho = buffer[inicio:fim_trecho + 1].strip()
+        if trecho:
+            yield trecho
+
+        inicio = fim_trecho + 1
+
+
+def dividir_texto(texto, limite_min=1300, limite_max=1500):
+    return list(dividir_em_trechos([texto], limite_min, limite_max))
+
+
+def cortes_gulosos(texto, limite_min=1300, limite_max=1500, cortes=None, alterado_em=0):
+    """Início de cada trecho de dividir_texto(texto.strip()), em posições do texto original.
+
+    Com os cortes da versão anterior e a posição da primeira alteração, só os trechos
+    que podem ter mudado são refeitos.
+    """
+    inicio_texto, fim_texto = 0, len(texto)
+    while inicio_texto < fim_texto and texto[inicio_texto].isspace():
+        inicio_texto += 1
+    while fim_texto > inicio_texto and texto[fim_texto - 1].isspace():
+        fim_texto -= 1
+    if inicio_texto >= fim_texto:
+        return []
+
+    if cortes and cortes[0] == inicio_texto:
+        # Um trecho só depende dos limite_max + 1 caracteres a partir do seu início
+        mantidos = 1
+        while mantidos < len(cortes) and cortes[mantidos - 1] + limite_max < min(alterado_em, fim_texto):
+            mantidos += 1
+        cortes = cortes[:mantidos]
+    else:
+        cortes = [inicio_texto]
+
+    inicio = cortes[-1]
+    while inicio < fim_texto:
+        fim = min(inicio + limite_max, fim_texto)
+        fim_trecho = max(texto.rfind('.', inicio, fim), texto.rfind(',', inicio, fim))
+
+        if fim_trecho == -1 or fim_trecho < inicio + limite_min:
+            fim_trecho = fim
+
+        inicio = fim_trecho + 1
+        if inicio < fim_texto:
+            cortes.append(inicio)
+    return cortes
+
+
+def indexar_limites(texto, limite_min=1300, limite_max=1500):
+    """Posições onde um trecho pode terminar e o custo de cada uma, numa única varredura.
+
+    Em cada faixa de (limite_max - limite_min) / LIMITES_POR_JANELA caracteres fica só o
+    limite mais barato, então texto com frases curtas não multiplica o trabalho da divisão.
+    """
+    passo = max(limite_max - limite_min, 1)
+    faixa = max(passo // LIMITES_POR_JANELA, 1)
+    posicoes, penalidades = [0], [0.0]
+
+    def adicionar(posicao, penalidade):
+        if posicao == posicoes[-1]:
+            penalidades[-1] = min(penalidades[-1], penalidade)
+        else:
+            posicoes.append(posicao)
+            penalidades.append(penalidade)
+
+    melhores = {}
+    for m in PADRAO_LIMITES.finditer(texto):
+        posicao, penalidade = m.end(), PENALIDADES[m.lastgroup]
+        anterior = melhores.get(posicao // faixa)
+        if anterior is None or penalidade <= anterior[1]:
+            melhores[posicao // faixa] = (posicao, penalidade)
+    limites = list(melhores.values())
+    limites.append((len(texto), 0.0))
+    for posicao, penalidade in limites:
+        # Entre dois limites nunca fica um vão maior que limite_max - limite_min; assim toda
+        # janela [limite_min, limite_max] tem onde cortar e a divisão sempre tem solução
+        while posicao - posicoes[-1] > passo:
+            atual = posicoes[-1]
+            espaco = texto.rfind(' ', atual + 1, atual + passo)
+            if espaco != -1:
+                adicionar(espaco + 1, PENALIDADES['palavra'])
+            else:
+                adicionar(atual + passo, PENALIDADES['forcado'])
+        adicionar(posicao, penalidade)
+    return posicoes, penalidades
+
+
+def dividir_equilibrado(texto, limite_min=1300, limite_max=1500):
+    """Escolhe os cortes de todo o texto de uma vez, com trechos perto do meio do intervalo.
+
+    Cada limite é comparado com no máximo LIMITES_POR_JANELA + 1 anteriores, então o
+    tempo cresce linearmente com o tamanho do texto.
+    """
+    posicoes, penalidades = indexar_limites(texto, limite_min, limite_max)
+    alvo = (limite_min + limite_max) / 2
+    escala = max(limite_max - limite_min, 1)
+    custo = [math.inf] * len(posicoes)
+    anterior = [-1] * len(posicoes)
+    custo[0] = 0.0
+
+    # Programação dinâmica sobre os limites; a janela de candidatos anda junto com j, então cada
+    # posição só é comparada com os limites que cabem entre limite_min e limite_max antes dela
+    inicio_janela = 0
+    ultimo = len(posicoes) - 1
+    for j in range(1, len(posicoes)):
+        posicao = posicoes[j]
+        # O último trecho pode ser menor que limite_min
+        maior = posicao - (1 if j == ultimo else limite_min)
+        while posicoes[inicio_janela] < posicao - limite_max:
+            inicio_janela += 1
+
+        i = inicio_janela
+        while i < j and posicoes[i] <= maior:
+            if custo[i] < custo[j]:
+                desvio = (posicao - posicoes[i] - alvo) / escala
+                total = custo[i] + desvio * desvio + penalidades[j]
+                if total < custo[j]:
+                    custo[j], anterior[j] = total, i
+            i += 1
+
+    cortes = []
+    j = ultimo
+    while j > 0:
+        cortes.append(posicoes[j])
+        j = anterior[j]
+    cortes.append(0)
+    cortes.reverse()
+
+    trechos = []
+    for inicio, fim in zip(cortes, cortes[1:]):
+        trecho = texto[inicio:fim].strip()
+        if trecho:
+            trechos.append(trecho)
+    return trechos
+
+
+def medir_trecho(trecho):
+    return len(trecho), trecho.rstrip('"”’»)]').endswith(FINAIS_DE_FRASE)
+
+
+def estatisticas_trechos(trechos):
+    """Tamanho dos trechos e quantos terminam em fim de frase, para comparar os modos."""
+    return resumir_medidas([medir_trecho(trecho) for trecho in trechos])
+
+
+def resumir_medidas(medidas):
+    """Mesmo resultado de estatisticas_trechos a partir de medir_trecho, sem guardar os trechos."""
+    if not medidas:
+        return {'trechos': 0}
+
+    tamanhos = [tamanho for tamanho, _ in medidas]
+    media = sum(tamanhos) / len(tamanhos)
+    frases = sum(1 for _, termina_em_frase in medidas if termina_em_frase)
+    return {
+        'trechos': len(tamanhos),
+        'minimo': min(tamanhos),
+        'maximo': max(tamanhos),
+        'media': round(media, 1),
+        'desvio': round(math.sqrt(sum((tamanho - media) ** 2 for tamanho in tamanhos) / len(tamanhos)), 1),
+        'terminam_em_frase': round(frases / len(tamanhos), 3),
+    }
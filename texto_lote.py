@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from substituicao_verbos import ARQUIVO_REGRAS, carregar_regras, SubstituidorVerbos
+from texto_divisor import (dividir_em_trechos, dividir_equilibrado, medir_trecho, resumir_medidas, aparar,
+                           ler_blocos, detectar_encoding_arquivo)
+
+FORMATOS = ('arquivos', 'jsonl')
+MODOS = ('guloso', 'equilibrado')
+
+
+def listar_capitulos(pasta):
+    return sorted(
+        os.path.join(pasta, nome) for nome in os.listdir(pasta)
+        if nome.lower().endswith('.txt') and os.path.isfile(os.path.join(pasta, nome))
+    )
+
+
+def gravar_arquivos(trechos, pasta_saida, nome):
+    """Um arquivo por trecho (nome_001.txt, nome_002.txt...) numa pasta por capítulo."""
+    pasta = os.path.join(pasta_saida, nome)
+    os.makedirs(pasta, exist_ok=True)
+    quantidade = 0
+    for quantidade, trecho in enumerate(trechos, 1):
+        with open(os.path.join(pasta, f"{nome}_{quantidade:03d}.txt"), 'w', encoding='utf-8') as f:
+            f.write(trecho)
+
+    # Os trechos chegam um a um, então o total só é conhecido no fim; acima de 999 a
+    # numeração é alargada para os arquivos continuarem em ordem
+    digitos = max(3, len(str(quantidade)))
+    gravados = set()
+    for i in range(1, quantidade + 1):
+        arquivo = f"{nome}_{i:0{digitos}d}.txt"
+        if digitos > 3:
+            os.replace(os.path.join(pasta, f"{nome}_{i:03d}.txt"), os.path.join(pasta, arquivo))
+        gravados.add(arquivo)
+
+    # Se o capítulo encolheu desde a última execução, os trechos a mais não podem ficar para trás
+    padrao = re.compile(re.escape(nome) + r'_\d+\.txt')
+    for arquivo in os.listdir(pasta):
+        if padrao.fullmatch(arquivo) and arquivo not in gravados:
+            os.remove(os.path.join(pasta, arquivo))
+    return pasta
+
+
+def gravar_jsonl(trechos, pasta_saida, nome):
+    """Um JSONL por capítulo, uma linha por trecho."""
+    caminho = os.path.join(pasta_saida, nome + '.jsonl')
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        for i, trecho in enumerate(trechos, 1):
+            linha = {'capitulo': nome, 'trecho': i, 'caracteres': len(trecho), 'texto': trecho}
+            f.write(json.dumps(linha, ensure_ascii=False) + '\n')
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def processar_capitulo(caminho, pasta_saida, regras, limite_min=1300, limite_max=1500, modo='guloso',
+                       formato='arquivos', encoding=None):
+    """Substitui os verbos e divide um capítulo; roda num processo do pool.
+
+    No modo guloso o capítulo passa do arquivo mapeado para os trechos gravados bloco a
+    bloco; o modo equilibrado precisa do texto inteiro para escolher os cortes.
+    """
+    encoding = encoding or detectar_encoding_arquivo(caminho)
+    blocos = aparar(ler_blocos(caminho, encoding=encoding))
+    contagens = Counter()
+    if regras:
+        blocos = SubstituidorVerbos(regras).substituir_blocos(blocos, contagens)
+
+    caracteres = 0
+    medidas = []
+
+    def contar_blocos(blocos):
+        nonlocal caracteres
+        for bloco in blocos:
+            caracteres += len(bloco)
+            yield bloco
+
+    def medir(trechos):
+        for trecho in trechos:
+            medidas.append(medir_trecho(trecho))
+            yield trecho
+
+    if modo == 'equilibrado':
+        trechos = dividir_equilibrado(''.join(contar_blocos(blocos)), limite_min, limite_max)
+    else:
+        trechos = dividir_em_trechos(contar_blocos(blocos), limite_min, limite_max)
+
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    gravar = gravar_jsonl if formato == 'jsonl' else gravar_arquivos
+    return {
+        'capitulo': nome,
+        'saida': gravar(medir(trechos), pasta_saida, nome),
+        'encoding': encoding,
+        'caracteres': caracteres,
+        'substituicoes': sum(contagens.values()),
+        'estatisticas': resumir_medidas(medidas),
+    }
+
+
+def processar_pasta(pasta, pasta_saida, regras, workers=1, log=None, **opcoes):
+    log = log or (lambda mensagem: None)
+    os.makedirs(pasta_saida, exist_ok=True)
+    capitulos = listar_capitulos(pasta)
+    resultados, erros = [], []
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(capitulos) or 1))) as executor:
+        pendentes = {
+            executor.submit(processar_capitulo, caminho, pasta_saida, regras, **opcoes): caminho
+            for caminho in capitulos
+        }
+        for future in as_completed(pendentes):
+            caminho = pendentes[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                erros.append((caminho, str(e)))
+                log(f"Erro em {os.path.basename(caminho)}: {e}")
+                continue
+            resultados.append(resultado)
+            log(f"{resultado['capitulo']}: {resultado['estatisticas']['trechos']} trechos, "
+                f"{resultado['substituicoes']} substituições")
+
+    resultados.sort(key=lambda resultado: resultado['capitulo'])
+    return {
+        'capitulos': len(resultados),
+        'trechos': sum(resultado['estatisticas']['trechos'] for resultado in resultados),
+        'caracteres': sum(resultado['caracteres'] for resultado in resultados),
+        'substituicoes': sum(resultado['substituicoes'] for resultado in resultados),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'resultados': resultados,
+        'erros': erros,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Substitui os verbos e divide em trechos todos os capítulos .txt de uma pasta, sem interface"
+    )
+    parser.add_argument('pasta', help="Pasta com os capítulos em .txt")
+    parser.add_argument('-o', '--saida', required=True, help="Pasta de saída")
+    parser.add_argument('--formato', choices=FORMATOS, default='arquivos',
+                        help="arquivos: uma pasta por capítulo com um .txt numerado por trecho; "
+                             "jsonl: um .jsonl por capítulo")
+    parser.add_argument('--modo', choices=MODOS, default='guloso', help="Modo de divisão")
+    parser.add_argument('--min', type=int, default=1300, dest='limite_min', help="Limite mínimo de caracteres")
+    parser.add_argument('--max', type=int, default=1500, dest='limite_max', help="Limite máximo de caracteres")
+    parser.add_argument('--regras', default=ARQUIVO_REGRAS, help="Arquivo JSON de substituições")
+    parser.add_argument('--sem-substituicao', action='store_true', help="Só divide, sem substituir verbos")
+    parser.add_argument('--encoding', help="Codificação dos capítulos (padrão: detectada em cada arquivo)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Capítulos processados em paralelo")
+    parser.add_argument('--relatorio', help="Grava o resumo com as estatísticas de cada capítulo em JSON")
+    args = parser.parse_args(argv)
+
+    if args.limite_min > args.limite_max:
+        print("O limite mínimo não pode ser maior que o máximo", file=sys.stderr)
+        return 2
+
+    regras = {} if args.sem_substituicao else carregar_regras(args.regras)
+    resumo = processar_pasta(
+        args.pasta, args.saida, regras, workers=args.workers, log=lambda mensagem: print(mensagem, file=sys.stderr),
+        limite_min=args.limite_min, limite_max=args.limite_max, modo=args.modo, formato=args.formato,
+        encoding=args.encoding
+    )
+
+    print(f"{resumo['capitulos']} capítulos, {resumo['trechos']} trechos, {resumo['caracteres']} caracteres, "
+          f"{resumo['substituicoes']} substituições em {resumo['segundos']:.2f}s")
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, indent=2, ensure_ascii=False)
+    return 1 if resumo['erros'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import queue
+import threading
+
+from PIL import Image
+
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.expanduser('~'), '.lility_imagem', 'miniaturas')
+
+
+def make_thumbnail(path, size):
+    image = Image.open(path)
+    thumb_width, thumb_height = size
+    img_width, img_height = image.size
+    # JPEG já é decodificado numa escala próxima da miniatura
+    image.draft('RGB', (thumb_width, max(round(img_height * thumb_width / img_width), 1)))
+    image = image.convert('RGB')
+
+    # Tiras muito altas virariam um risco; a miniatura mostra o topo da página
+    max_height = round(image.size[0] * thumb_height / thumb_width)
+    if image.size[1] > max_height:
+        image = image.crop((0, 0, image.size[0], max_height))
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    return image
+
+
+class ThumbnailCache:
+    def __init__(self, folder=DEFAULT_CACHE_FOLDER, size=(80, 120)):
+        self.folder = folder
+        self.size = tuple(size)
+        os.makedirs(self.folder, exist_ok=True)
+
+    def cache_path(self, path):
+        # Caminho, data de modificação e tamanho: qualquer alteração no arquivo gera outra chave
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size[0]}x{self.size[1]}"
+        return os.path.join(self.folder, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def get(self, path):
+        cached = self.cache_path(path)
+        if os.path.exists(cached):
+            try:
+                with Image.open(cached) as image:
+                    image.load()
+                    return image.copy()
+            except OSError:
+                pass
+
+        image = make_thumbnail(path, self.size)
+        # Grava num temporário e renomeia para nunca deixar uma miniatura pela metade no cache
+        temporary = f"{cached}.{threading.get_ident()}.tmp"
+        image.save(temporary, format='PNG')
+        os.replace(temporary, cached)
+        return image
+
+
+class ThumbnailWorker:
+    def __init__(self, thumbnail_cache):
+        self.thumbnail_cache = thumbnail_cache
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, key, path):
+        self.requests.put((key, path))
+
+    def _run(self):
+        while True:
+            key, path = self.requests.get()
+            try:
+                image = self.thumbnail_cache.get(path)
+            except Exception:
+                continue
+            self.results.put((key, image))